@@ -2,6 +2,8 @@
 Code generator for creating tools in the AutoGen Toolsmith system.
 """
 
+import asyncio
+import hashlib
 import importlib
 import inspect
 import json
@@ -16,13 +18,16 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 import pytest
 
 from autogen_toolsmith.generator.code_validator import CodeValidator
-from autogen_toolsmith.generator.prompt_templates import TOOL_TEMPLATE, TEST_TEMPLATE, DOCUMENTATION_TEMPLATE, UPDATE_TEMPLATE, UPDATE_WITH_TEST_RESULTS_TEMPLATE
+from autogen_toolsmith.generator.prompt_templates import TOOL_TEMPLATE, TEST_TEMPLATE, DOCUMENTATION_TEMPLATE, UPDATE_TEMPLATE, render_update
 from autogen_toolsmith.storage.registry import registry, init_registry
 from autogen_toolsmith.storage.versioning import version_manager
-from autogen_toolsmith.tools.base.tool_base import BaseTool
+from autogen_toolsmith.tools.base.tool_base import BaseTool, resolve_category
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_toolsmith.tools import get_tool
 
+_SYSTEM_PROMPT = "You are an expert code generator for Python tools. Respond with only the code, no explanations."
+_TEMPERATURE = 0.2
+
 class ToolGenerator:
     """Generator for creating and updating tools in the AutoGen Toolsmith system."""
     
@@ -30,6 +35,8 @@ class ToolGenerator:
         self,
         model_client: Optional[OpenAIChatCompletionClient] = None,
         storage_dirs: Optional[List[str]] = None,
+        cache_dir: Optional[str] = None,
+        cache_model: Optional[str] = None,
     ):
         """Initialize the tool generator.
         
@@ -38,8 +45,21 @@ class ToolGenerator:
                         If None, only tool listing and retrieval functions will work.
             storage_dirs: List of directories to store and load tool data.
                         If None, uses the default directory.
+            cache_dir: Optional directory for caching model responses on disk.
+                        A prompt whose response was already accepted with the
+                        same model is answered from the cache instead of
+                        calling the model.
+            cache_model: The name of the model behind model_client, used in
+                        the cache key. Caching is disabled if it is not given,
+                        so responses from different models are never mixed.
         """
         self.model_client = model_client
+        self.cache_model = cache_model
+        self.cache_dir = Path(cache_dir) if cache_dir and cache_model else None
+        if cache_dir and not cache_model:
+            print("Warning: cache_dir is ignored because cache_model was not given.")
+        if self.cache_dir:
+            self.cache_dir.mkdir(exist_ok=True, parents=True)
         
         # Initialize registry with storage directories if provided
         if storage_dirs:
@@ -47,11 +67,25 @@ class ToolGenerator:
         
         self.validator = CodeValidator()
     
-    async def _generate_code(self, prompt: str) -> str:
+    async def _generate_code(
+        self,
+        prompt: str,
+        stream_to: Optional[str] = None,
+        use_cache: bool = True
+    ) -> str:
         """Generate code using the model client.
         
+        A cached response is returned if there is one, but new responses are
+        not cached here: callers store them with ``_store_cached_response``
+        once they have been accepted, so a response that fails validation is
+        sampled again next time.
+        
         Args:
             prompt: The prompt to use for code generation.
+            stream_to: Optional debug file to append the raw response to. The
+                response is streamed and each chunk is written as it arrives;
+                nothing is written for a cached response.
+            use_cache: Whether a cached response may be returned.
             
         Returns:
             str: The generated code.
@@ -61,24 +95,46 @@ class ToolGenerator:
         """
         if self.model_client is None:
             raise ValueError("Model client is required for code generation. Please provide a model_client when initializing ToolGenerator.")
+        
+        # 命中磁盘缓存时直接返回，不再调用模型
+        cache_file = self._cache_file(prompt) if use_cache else None
+        if cache_file is not None and cache_file.exists():
+            return cache_file.read_text()
             
         from autogen_core.models import SystemMessage, UserMessage
         
-        response = await self.model_client.create(
-            messages=[
-                SystemMessage(
-                    content="You are an expert code generator for Python tools. Respond with only the code, no explanations.",
-                    source="system"
-                ),
-                UserMessage(
-                    content=prompt,
-                    source="user"
-                )
-            ],
-            extra_create_args={
-                "temperature": 0.2
-            }
-        )
+        messages = [
+            SystemMessage(
+                content=_SYSTEM_PROMPT,
+                source="system"
+            ),
+            UserMessage(
+                content=prompt,
+                source="user"
+            )
+        ]
+        extra_create_args = {
+            "temperature": _TEMPERATURE
+        }
+        
+        if stream_to:
+            # 流式输出：文本块到达时立即写入文件，最后一项是完整的 CreateResult
+            response = None
+            with open(stream_to, "a") as f:
+                async for chunk in self.model_client.create_stream(
+                    messages=messages,
+                    extra_create_args=extra_create_args
+                ):
+                    if isinstance(chunk, str):
+                        f.write(chunk)
+                        f.flush()
+                    else:
+                        response = chunk
+        else:
+            response = await self.model_client.create(
+                messages=messages,
+                extra_create_args=extra_create_args
+            )
         
         # 处理返回结果 - 根据新的model_client接口提取内容
         if hasattr(response, 'content'):
@@ -88,6 +144,42 @@ class ToolGenerator:
         # 如果无法提取内容，抛出异常
         raise ValueError(f"Unable to extract content from model response: {response}")
     
+    def _cache_file(self, prompt: str) -> Optional[Path]:
+        """Get the response cache file for a prompt.
+        
+        The key covers the model name, the system prompt, the temperature and
+        the prompt itself, so changing any of them misses the cache.
+        
+        Args:
+            prompt: The prompt sent to the model.
+            
+        Returns:
+            Optional[Path]: The cache file, or None if caching is disabled.
+        """
+        if self.cache_dir is None:
+            return None
+        
+        key = hashlib.sha256(
+            json.dumps([self.cache_model, _SYSTEM_PROMPT, _TEMPERATURE, prompt]).encode()
+        ).hexdigest()
+        return self.cache_dir / f"{key}.txt"
+    
+    def _store_cached_response(self, prompt: str, content: str) -> None:
+        """Cache an accepted model response for a prompt.
+        
+        Args:
+            prompt: The prompt sent to the model.
+            content: The response to return for this prompt from now on.
+        """
+        cache_file = self._cache_file(prompt)
+        if cache_file is None:
+            return
+        
+        # 先写临时文件再重命名，避免留下不完整的缓存
+        tmp_file = cache_file.with_suffix(".tmp")
+        tmp_file.write_text(content)
+        os.replace(tmp_file, cache_file)
+    
     def _extract_code_block(self, text: str) -> str:
         """Extract code block from text.
         
@@ -253,11 +345,12 @@ class ToolGenerator:
             specification=specification,
             existing_tools_info=existing_tools_info
         )
-        tool_code_raw = await self._generate_code(tool_prompt)
-
-        # save the tool_code_raw to a debug file
-        with open("tool_code_raw.txt", "a") as f:
-            f.write(tool_code_raw)
+        # The raw response is streamed into a debug file in the validator's
+        # scratch directory; each specification gets its own file so that
+        # concurrent calls from create_tools_batch do not interleave
+        spec_hash = hashlib.sha256(specification.encode()).hexdigest()[:12]
+        debug_file = os.path.join(self.validator.scratch_dir, f"tool_code_raw_{spec_hash}.txt")
+        tool_code_raw = await self._generate_code(tool_prompt, stream_to=debug_file)
         
         # Extract and validate the tool code
         tool_code = self._extract_code_block(tool_code_raw)
@@ -305,6 +398,11 @@ class ToolGenerator:
             print("Error: Could not create tool instance from generated code.")
             return None
         
+        # 代码已通过校验，缓存这些响应
+        self._store_cached_response(tool_prompt, tool_code_raw)
+        self._store_cached_response(test_prompt, test_code_raw)
+        self._store_cached_response(doc_prompt, doc_raw)
+        
         if register:
             # 确保目录存在
             if output_dir:
@@ -334,6 +432,49 @@ class ToolGenerator:
         
         # Return the tool name instead of file path for easier tool calling
         return tool_metadata["name"]
+    
+    async def create_tools_batch(
+        self,
+        specifications: List[str],
+        output_dirs: Optional[List[Optional[str]]] = None,
+        register: bool = True,
+        max_concurrency: int = 4
+    ) -> List[Optional[str]]:
+        """Create several independent tools concurrently.
+        
+        Each tool is created with ``create_tool``; up to ``max_concurrency``
+        of them run at the same time, so their model calls overlap.
+        
+        Args:
+            specifications: The tool specifications.
+            output_dirs: Optional output directory for each specification.
+                       If None, every tool uses the ``create_tool`` default.
+            register: Whether to register the tools in the registry.
+            max_concurrency: Maximum number of tools created at the same time.
+            
+        Returns:
+            List[Optional[str]]: The tool name for each specification, in
+                order, or None where creation failed.
+        """
+        if output_dirs is None:
+            output_dirs = [None] * len(specifications)
+        if len(output_dirs) != len(specifications):
+            raise ValueError("output_dirs must have one entry per specification")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def create_one(specification: str, output_dir: Optional[str]) -> Optional[str]:
+            async with semaphore:
+                try:
+                    return await self.create_tool(specification, output_dir=output_dir, register=register)
+                except Exception as e:
+                    print(f"Error creating tool: {e}")
+                    return None
+        
+        return list(await asyncio.gather(*(
+            create_one(specification, output_dir)
+            for specification, output_dir in zip(specifications, output_dirs)
+        )))
         
 
     async def update_tool(
@@ -412,6 +553,11 @@ class ToolGenerator:
                 print("Error: Could not create tool instance from updated code.")
                 return None
             
+            # 代码已通过校验，缓存这些响应
+            self._store_cached_response(update_prompt, updated_code_raw)
+            self._store_cached_response(test_prompt, test_code_raw)
+            self._store_cached_response(doc_prompt, doc_raw)
+            
             if register:
                 # 确保目录存在
                 if output_dir:
@@ -469,10 +615,7 @@ class ToolGenerator:
             
             # Extract the category
             category_match = re.search(r'category\s*=\s*["\']([^"\']+)["\']', code)
-            category = category_match.group(1) if category_match else "utility_tools"
-            
-            if category not in ["data_tools", "api_tools", "utility_tools"]:
-                category = "utility_tools"
+            category = resolve_category(category_match.group(1) if category_match else None)
             
             # Extract the description
             description_match = re.search(r'description\s*=\s*["\']([^"\']+)["\']', code)
@@ -606,30 +749,13 @@ class ToolGenerator:
         Returns:
             List[Dict[str, Any]]: 工具信息列表。
         """
-        # 获取所有工具名称
-        tool_names = []
-        if category:
-            # 按类别过滤
-            for name, tool in registry.tools.items():
-                if tool.metadata.category == category:
-                    tool_names.append(name)
-        else:
-            # 获取所有工具
-            tool_names = list(registry.tools.keys())
-        
-        # 获取工具详细信息
-        tools_list = []
-        for name in tool_names:
-            tool = registry.get_tool(name)
-            if tool:
-                tool_dict = tool.to_dict()
-                tools_list.append(tool_dict)
+        # 通过注册表的类别索引获取元数据，不遍历所有工具也不导入工具模块
+        metadata_list = registry.list_tools(category)
         
         if not verbose:
             # 简化输出，只包含基本信息
             simplified_list = []
-            for tool_data in tools_list:
-                metadata = tool_data.get("metadata", {})
+            for metadata in metadata_list:
                 simplified_list.append({
                     "name": metadata.get("name", "unknown"),
                     "description": metadata.get("description", ""),
@@ -641,6 +767,8 @@ class ToolGenerator:
                 })
             return simplified_list
         
+        # 获取工具详细信息（直接读取索引，避免导入工具模块）
+        tools_list = [registry.get_tool_info(metadata["name"]) for metadata in metadata_list]
         return tools_list
     
     def print_available_tools(self, category: Optional[str] = None):
@@ -692,21 +820,17 @@ class ToolGenerator:
         Returns:
             Optional[Dict[str, Any]]: 工具详细信息，如果工具不存在则返回None。
         """
-        tool = registry.get_tool(tool_name)
-        if not tool:
-            return None
-        
-        # 获取工具的详细信息
-        tool_dict = tool.to_dict()
-        
-        return tool_dict
+        # 索引中的条目就是工具的 to_dict()，直接按名称查找（返回副本），不需要导入工具模块
+        return registry.get_tool_info(tool_name)
 
     async def update_with_test_results(
         self,
         tool_name: str,
         test_results: str,
         output_dir: Optional[str] = None,
-        register: bool = True
+        register: bool = True,
+        tool_file: Optional[str] = None,
+        test_file: Optional[str] = None
     ) -> Tuple[bool, str, Optional[str]]:
         """Update a tool or its tests based on test results.
         
@@ -716,6 +840,10 @@ class ToolGenerator:
             output_dir: Optional directory to store the updated tool.
                        If None, uses "./tools" directory.
             register: Whether to register the updated tool.
+            tool_file: Optional path to the tool's source file. When both
+                       tool_file and test_file are given, the registry lookup
+                       is skipped.
+            test_file: Optional path to the tool's test file.
             
         Returns:
             Tuple[bool, str, Optional[str]]: 
@@ -730,13 +858,20 @@ class ToolGenerator:
             
         # Get the existing tool and its code
         try:
-            tool = get_tool(tool_name, storage_dir=output_dir)
-            if not tool:
-                return False, f"Error: Tool '{tool_name}' not found.", None
+            if tool_file and test_file:
+                # Paths already resolved by the caller
+                tool_file_path = tool_file
+                test_file_path = test_file
+            else:
+                tool = get_tool(tool_name, storage_dir=output_dir)
+                if not tool:
+                    return False, f"Error: Tool '{tool_name}' not found.", None
+                
+                category = tool.metadata.category
+                tool_file_path = os.path.join(output_dir, category, f"{tool_name}.py")
+                test_file_path = os.path.join(output_dir, category, "tests", f"test_{tool_name}.py")
             
             # 改为直接从文件读取源码，而不是使用tool.get_source()
-            category = tool.metadata.category
-            tool_file_path = os.path.join(output_dir, category, f"{tool_name}.py")
             try:
                 with open(tool_file_path, "r") as f:
                     tool_code = f.read()
@@ -747,13 +882,11 @@ class ToolGenerator:
         
         # Get the current test code
         try:
-            test_file_path = os.path.join(output_dir, tool.metadata.category, "tests", f"test_{tool_name}.py")
-            try:
-                with open(test_file_path, "r") as f:
-                    test_code = f.read()
-            except FileNotFoundError:
-                test_code = ""
-                print(f"Warning: No existing test file found at {test_file_path}")
+            with open(test_file_path, "r") as f:
+                test_code = f.read()
+        except FileNotFoundError:
+            test_code = ""
+            print(f"Warning: No existing test file found at {test_file_path}")
         except Exception as e:
             return False, f"Error retrieving test code: {str(e)}", None
         
@@ -762,7 +895,7 @@ class ToolGenerator:
         
         # Generate updated code based on test results
         try:
-            update_prompt = UPDATE_WITH_TEST_RESULTS_TEMPLATE.format(
+            update_prompt = render_update(
                 tool_code=tool_code,
                 test_code=test_code,
                 test_results=processed_test_results
@@ -772,7 +905,9 @@ class ToolGenerator:
             with open("update_prompt_debug.txt", "a") as f:
                 f.write(update_prompt)
                 
-            updated_code_raw = await self._generate_code(update_prompt)
+            # Never answered from the cache: this is called again with the same
+            # prompt when the previous fix was rejected, and must re-sample
+            updated_code_raw = await self._generate_code(update_prompt, use_cache=False)
             updated_code = self._extract_code_block(updated_code_raw)
             
             if not updated_code:
@@ -835,50 +970,34 @@ class ToolGenerator:
             str: Processed test results with the most relevant information.
         """
         # If the test results are already short, return them as is
-        if len(test_results.split('\n')) < 100:
+        if test_results.count('\n') < 99:
             return test_results
             
-        # Extract the most relevant parts of the test results
-        processed_results = []
-        
-        # Split the test results into lines
-        lines = test_results.split('\n')
+        # Split the test results into lines once and reuse the list
+        lines = test_results.splitlines()
         
-        # Add the first few lines (summary)
-        summary_lines = min(10, len(lines))
-        processed_results.extend(lines[:summary_lines])
+        # Start with the first few lines (summary)
+        processed_results = lines[:10]
         processed_results.append("...")
         
-        # Look for error and failure information
-        error_sections = []
-        current_section = []
-        in_error_section = False
+        # Look for error and failure information in a single pass, writing
+        # each section straight into the output buffer
+        section_length = 0  # 0 means we are not inside an error section
         
         for line in lines:
             # Look for lines that indicate test failures or errors
             if "FAILED" in line or "ERROR" in line or "AssertionError" in line or "E       " in line:
-                if not in_error_section:
-                    in_error_section = True
-                    current_section = [line]
-                else:
-                    current_section.append(line)
-            elif in_error_section:
+                if not section_length:
+                    processed_results.append("-" * 60)
+                processed_results.append(line)
+                section_length += 1
+            elif section_length:
                 # If we've collected at least 3 lines and hit a blank line, end the section
-                if len(current_section) >= 3 and not line.strip():
-                    error_sections.append(current_section)
-                    current_section = []
-                    in_error_section = False
+                if section_length >= 3 and not line.strip():
+                    section_length = 0
                 else:
-                    current_section.append(line)
-        
-        # Add any remaining error section
-        if in_error_section and current_section:
-            error_sections.append(current_section)
-        
-        # Add all error sections to the processed results
-        for section in error_sections:
-            processed_results.append("-" * 60)
-            processed_results.extend(section)
+                    processed_results.append(line)
+                    section_length += 1
         
         # Add the last few lines (summary)
         if len(lines) > 20:
@@ -952,7 +1071,9 @@ class ToolGenerator:
             update_result = await self.update_with_test_results(
                 tool_name=tool_name,
                 test_results=test_output,
-                output_dir=output_dir
+                output_dir=output_dir,
+                tool_file=tool_file,
+                test_file=test_file
             )
             
             success, message, updated_tool_name = update_result
@@ -1,18 +1,80 @@
+import atexit
 import io
 import os
+import re
+import shutil
 import sys
 import tempfile
 import traceback
-import xml.etree.ElementTree as ET
 from contextlib import redirect_stdout, redirect_stderr
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Any, Iterator, Tuple, Union
 
 import pytest
 
+try:
+    from lxml import etree as _etree
+    _HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as _etree
+    _HAS_LXML = False
+
+# Patterns flagged by validate_security, compiled once at import time
+_DANGEROUS_PATTERNS = [
+    (re.compile(r"os\.system\("), "Direct system command execution"),
+    (re.compile(r"subprocess\."), "Subprocess execution"),
+    (re.compile(r"eval\("), "Code evaluation"),
+    (re.compile(r"exec\("), "Code execution"),
+    (re.compile(r"__import__\("), "Dynamic imports"),
+    (re.compile(r"open\(.+,\s*['\"]w['\"]"), "File writing")
+]
+
+def _iter_testcases(xml_path: str) -> Iterator[Any]:
+    """Stream ``testcase`` elements from a JUnit XML report.
+    
+    Each element is cleared once the caller has finished with it, so memory
+    use stays bounded regardless of the size of the test suite.
+    
+    Args:
+        xml_path: Path to the JUnit XML file.
+        
+    Yields:
+        The ``testcase`` elements in document order.
+    """
+    if _HAS_LXML:
+        events = _etree.iterparse(xml_path, events=("end",), tag="testcase")
+    else:
+        events = (
+            (event, elem) for event, elem in _etree.iterparse(xml_path, events=("end",))
+            if elem.tag == "testcase"
+        )
+    
+    for _, testcase in events:
+        yield testcase
+        testcase.clear()
+
+
 class CodeValidator:
     """Validator for generated code."""
     
+    def __init__(self):
+        """Initialize the validator.
+        
+        A single scratch directory is shared by every ``run_tests`` call made
+        through this validator (the tool generator also keeps its debug
+        output there). It is created on first use, so validators that never
+        need it do not create one, and removed when the interpreter exits.
+        """
+        self._tmpdir = None
+    
+    @property
+    def scratch_dir(self) -> str:
+        """The validator's scratch directory, created on first access."""
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.mkdtemp(prefix="autogen_toolsmith_")
+            atexit.register(shutil.rmtree, self._tmpdir, ignore_errors=True)
+        return self._tmpdir
+    
     @staticmethod
     def validate_syntax(code: str) -> bool:
         """Check if the code has valid Python syntax.
@@ -40,24 +102,13 @@ class CodeValidator:
             Tuple[bool, str]: A tuple of (is_safe, reason).
         """
         # This is a very basic check and should be expanded for production use
-        import re
-        dangerous_patterns = [
-            (r"os\.system\(", "Direct system command execution"),
-            (r"subprocess\.", "Subprocess execution"),
-            (r"eval\(", "Code evaluation"),
-            (r"exec\(", "Code execution"),
-            (r"__import__\(", "Dynamic imports"),
-            (r"open\(.+,\s*['\"]w['\"]", "File writing")
-        ]
-        
-        for pattern, reason in dangerous_patterns:
-            if re.search(pattern, code):
+        for pattern, reason in _DANGEROUS_PATTERNS:
+            if pattern.search(code):
                 return False, f"Security issue: {reason}"
         
         return True, ""
     
-    @staticmethod
-    def run_tests(tool_file: Union[str, Path], test_file: Union[str, Path]) -> Tuple[bool, str]:
+    def run_tests(self, tool_file: Union[str, Path], test_file: Union[str, Path]) -> Tuple[bool, str]:
         """Run tests for the generated tool.
         
         Args:
@@ -80,90 +131,74 @@ class CodeValidator:
         tool_dir = tool_file_path.parent
         sys.path.insert(0, str(tool_dir))
         
+        xml_path = os.path.join(self.scratch_dir, "pytest.xml")
+        
         try:
-            # Capture the output from pytest using a temporary file
-            import tempfile
-            import os
+            # Truncate the results file left over from the previous run
+            open(xml_path, 'w').close()
+            
+            # Run pytest and save structured results to the shared XML file
+            # -v: verbose, --no-header: remove header, --no-summary: remove summary
+            # -s: don't capture stdout/stderr
+            result = pytest.main([
+                "-vvs",  # Very verbose, don't capture stdout/stderr
+                f"--tb=long",  # Long traceback format
+                f"--capture=tee-sys",  # Capture output and also show it
+                f"--junitxml={xml_path}",  # Save results in JUnit XML format
+                str(test_file_path)
+            ])
             
-            # Create a temporary file to capture pytest output
-            with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.txt') as temp_file:
-                temp_file_path = temp_file.name
+            full_output = ""
             
+            # Try to read the JUnit XML file for structured test results
             try:
-                # Run pytest with output redirected to the temporary file
-                # -v: verbose, --no-header: remove header, --no-summary: remove summary
-                # -s: don't capture stdout/stderr (let it go to our file)
-                result = pytest.main([
-                    "-vvs",  # Very verbose, don't capture stdout/stderr
-                    f"--tb=long",  # Long traceback format
-                    f"--capture=tee-sys",  # Capture output and also show it
-                    f"--junitxml={temp_file_path}.xml",  # Save results in JUnit XML format
-                    str(test_file_path)
-                ])
-                
-                # Read the captured output from the temporary file
-                full_output = ""
-                
-                # Try to read the JUnit XML file for structured test results
-                try:
-                    tree = ET.parse(f"{temp_file_path}.xml")
-                    root = tree.getroot()
+                # Extract test case results
+                for testcase in _iter_testcases(xml_path):
+                    test_name = testcase.get('name')
+                    class_name = testcase.get('classname')
                     
-                    # Extract test case results
-                    for testcase in root.findall('.//testcase'):
-                        test_name = testcase.get('name')
-                        class_name = testcase.get('classname')
-                        
-                        # Check if the test failed
-                        failure = testcase.find('failure')
-                        error = testcase.find('error')
-                        
-                        if failure is not None:
-                            full_output += f"\nFAILED: {class_name}::{test_name}\n"
-                            full_output += f"Reason: {failure.get('message')}\n"
-                            full_output += f"{failure.text}\n"
-                            full_output += "-" * 60 + "\n"
-                        elif error is not None:
-                            full_output += f"\nERROR: {class_name}::{test_name}\n"
-                            full_output += f"Reason: {error.get('message')}\n"
-                            full_output += f"{error.text}\n"
-                            full_output += "-" * 60 + "\n"
-                except Exception as xml_error:
-                    # If we can't parse the XML, just note it
-                    full_output += f"Note: Could not parse detailed test results: {str(xml_error)}\n"
-                
-                # Capture stdout/stderr directly as well
-                stdout_capture = io.StringIO()
-                stderr_capture = io.StringIO()
-                
-                # Run the tests again with output redirection to get console output
-                with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                    pytest.main(["-vvs", str(test_file_path)])
-                
-                stdout_output = stdout_capture.getvalue()
-                stderr_output = stderr_capture.getvalue()
-                
-                # Add the console output to our full output
-                if not full_output.strip():  # If we didn't get anything from XML
-                    full_output = stdout_output + "\n" + stderr_output
-                
-                # Pytest exit codes: 0 = success, 1 = tests failed, 2 = errors, others = other errors
-                success = result == 0
-                
-                # Create a detailed message with the exit code and full output
-                message = f"Tests {'passed' if success else 'failed'} with exit code {result}\n\n"
-                message += "=== Test Output ===\n"
-                message += full_output
-                
-                return success, message
-            finally:
-                # Clean up temporary files
-                try:
-                    os.unlink(temp_file_path)
-                    if os.path.exists(f"{temp_file_path}.xml"):
-                        os.unlink(f"{temp_file_path}.xml")
-                except Exception:
-                    pass  # Ignore cleanup errors
+                    # Check if the test failed
+                    failure = testcase.find('failure')
+                    error = testcase.find('error')
+                    
+                    if failure is not None:
+                        full_output += f"\nFAILED: {class_name}::{test_name}\n"
+                        full_output += f"Reason: {failure.get('message')}\n"
+                        full_output += f"{failure.text}\n"
+                        full_output += "-" * 60 + "\n"
+                    elif error is not None:
+                        full_output += f"\nERROR: {class_name}::{test_name}\n"
+                        full_output += f"Reason: {error.get('message')}\n"
+                        full_output += f"{error.text}\n"
+                        full_output += "-" * 60 + "\n"
+            except Exception as xml_error:
+                # If we can't parse the XML, just note it
+                full_output += f"Note: Could not parse detailed test results: {str(xml_error)}\n"
+            
+            # Capture stdout/stderr directly as well
+            stdout_capture = io.StringIO()
+            stderr_capture = io.StringIO()
+            
+            # Run the tests again with output redirection to get console output
+            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
+                pytest.main(["-vvs", str(test_file_path)])
+            
+            stdout_output = stdout_capture.getvalue()
+            stderr_output = stderr_capture.getvalue()
+            
+            # Add the console output to our full output
+            if not full_output.strip():  # If we didn't get anything from XML
+                full_output = stdout_output + "\n" + stderr_output
+            
+            # Pytest exit codes: 0 = success, 1 = tests failed, 2 = errors, others = other errors
+            success = result == 0
+            
+            # Create a detailed message with the exit code and full output
+            message = f"Tests {'passed' if success else 'failed'} with exit code {result}\n\n"
+            message += "=== Test Output ===\n"
+            message += full_output
+            
+            return success, message
                 
         except Exception as e:
             return False, f"Test execution error: {str(e)}\n{traceback.format_exc()}"
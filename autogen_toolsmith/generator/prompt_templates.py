@@ -2,6 +2,9 @@
 Prompt templates for code generation.
 """
 
+import re
+from typing import Dict, Tuple
+
 TOOL_TEMPLATE = """
 You are an expert in developing Python tools for the AutoGen framework. Your task is to create a new tool based on the following specification:
 
@@ -199,4 +202,118 @@ You are an expert technical writer. Your task is to create documentation for the
 
 # Output Format
 Return the documentation in Markdown format.
-""" 
\ No newline at end of file
+"""
+
+
+UPDATE_TEMPLATE = """
+You are an expert in developing Python tools for the AutoGen framework. Your task is to update the existing tool `{tool_name}` according to the update specification below.
+
+# Existing Tool Code
+```python
+{existing_code}
+```
+
+# Update Specification
+{update_specification}
+
+# Update Requirements
+- Keep the class name, the tool name and the category unchanged
+- Preserve existing behaviour unless the specification asks to change it
+- Bump the version number in the constructor
+- Keep proper typing, documentation and error handling
+
+# Output Format
+Return only the complete updated Python code for the tool, with no additional text before or after the code.
+"""
+
+
+UPDATE_WITH_TEST_RESULTS_TEMPLATE = """
+You are an expert in debugging Python code. The tests for the following tool are failing. Your task is to fix either the tool or its tests.
+
+# Tool Code
+```python
+{tool_code}
+```
+
+# Test Code
+```python
+{test_code}
+```
+
+# Test Results
+```
+{test_results}
+```
+
+# Fix Requirements
+- Decide whether the failures are caused by a bug in the tool or by incorrect tests
+- Fix only one of the two: return either the updated tool code or the updated test code
+- Keep the class name, the tool name and the category unchanged
+- Do not remove tests just to make them pass
+
+# Output Format
+Return only the complete Python code of the file you fixed, with no additional text before or after the code.
+"""
+
+
+_FIELD_RE = re.compile(r"\{(\w+)\}")
+
+
+def _split_template(template: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split a template into its literal segments and placeholder names.
+    
+    Args:
+        template: A template using ``{name}`` placeholders.
+        
+    Returns:
+        Tuple[Tuple[str, ...], Tuple[str, ...]]: (literals, names), where
+            ``len(literals) == len(names) + 1``.
+    """
+    parts = _FIELD_RE.split(template)
+    return tuple(parts[0::2]), tuple(parts[1::2])
+
+
+def _render(split_template: Tuple[Tuple[str, ...], Tuple[str, ...]], fields: Dict[str, str]) -> str:
+    """Render a pre-split template by joining literals and field values.
+    
+    Args:
+        split_template: The result of ``_split_template``.
+        fields: The values for each placeholder.
+        
+    Returns:
+        str: The rendered prompt.
+        
+    Raises:
+        KeyError: If a placeholder has no value in ``fields``.
+    """
+    literals, names = split_template
+    parts = [literals[0]]
+    for name, literal in zip(names, literals[1:]):
+        parts.append(str(fields[name]))
+        parts.append(literal)
+    return "".join(parts)
+
+
+# Split once at import time so rendering is a single join
+_UPDATE_WITH_TEST_RESULTS_PARTS = _split_template(UPDATE_WITH_TEST_RESULTS_TEMPLATE)
+
+
+def render_update(tool_code: str, test_code: str, test_results: str) -> str:
+    """Render UPDATE_WITH_TEST_RESULTS_TEMPLATE.
+    
+    Equivalent to ``UPDATE_WITH_TEST_RESULTS_TEMPLATE.format(...)`` but skips
+    format-spec parsing, which matters in the run_tests_and_update loop.
+    
+    Args:
+        tool_code: The current tool code.
+        test_code: The current test code.
+        test_results: The (processed) pytest output.
+        
+    Returns:
+        str: The rendered prompt.
+    """
+    return _render(_UPDATE_WITH_TEST_RESULTS_PARTS, {
+        "tool_code": tool_code,
+        "test_code": test_code,
+        "test_results": test_results,
+    })
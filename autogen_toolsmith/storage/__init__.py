@@ -0,0 +1,8 @@
+"""
+Storage for tools in the AutoGen Toolsmith system.
+"""
+
+from pathlib import Path
+
+# The autogen_toolsmith package directory, resolved once at import time
+_PACKAGE_DIR = Path(__file__).resolve().parent.parent
@@ -0,0 +1,46 @@
+"""
+Compact JSON helpers for the storage files.
+
+``orjson`` is used when it is installed and the standard library ``json``
+module otherwise; both produce compact output that either one can read.
+"""
+
+from typing import Any
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    import json
+    _HAS_ORJSON = False
+
+
+def dumps(obj: Any) -> str:
+    """Serialize an object to a compact JSON string.
+
+    Args:
+        obj: The object to serialize.
+
+    Returns:
+        str: The JSON text, without whitespace between tokens.
+    """
+    if _HAS_ORJSON:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON text.
+
+    Args:
+        data: The JSON text, as ``str`` or ``bytes``.
+
+    Returns:
+        Any: The decoded object.
+
+    Raises:
+        ValueError: If the text is not valid JSON.
+    """
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -2,42 +2,186 @@
 Tool registry for storing and retrieving tools.
 """
 
-import json
+import bisect
 import os
 import importlib.util
-import inspect
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Type, Union, Tuple
 
-from autogen_toolsmith.tools.base.tool_base import BaseTool
+from autogen_toolsmith.storage import _PACKAGE_DIR, jsonio
+from autogen_toolsmith.tools.base.tool_base import CATEGORIES, BaseTool, ToolMetadata, resolve_category
+
+# Format version of tool_manifest.json; manifests with another version are ignored
+_MANIFEST_VERSION = 2
+
+
+def _import_tool_module(module_name: str, path: str):
+    """Import a tool module from its file.
+    
+    Args:
+        module_name: The fully qualified name to give the module.
+        path: The path to the module's source file.
+        
+    Returns:
+        The executed module, or None if no loader could be created.
+    """
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if not (spec and spec.loader):
+        return None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _tool_subclasses() -> List[Type[BaseTool]]:
+    """Return every subclass of BaseTool, direct or indirect.
+    
+    Returns:
+        List[Type[BaseTool]]: The subclasses, each parent before its children.
+    """
+    classes: List[Type[BaseTool]] = [BaseTool]
+    seen = {BaseTool}
+    # classes grows while it is walked, which gives a breadth-first order
+    for cls in classes:
+        for subclass in cls.__subclasses__():
+            if subclass not in seen:
+                seen.add(subclass)
+                classes.append(subclass)
+    return classes[1:]
+
+
+def _load_tool_instances(module_name: str, path: str) -> List[BaseTool]:
+    """Import a tool module and instantiate the tools it defines.
+    
+    The tool classes are the BaseTool subclasses created while the module
+    executes, so the module namespace is never scanned. Only classes defined
+    in the module itself are kept; this also skips classes created at the
+    same time by imports running in other threads.
+    
+    Args:
+        module_name: The fully qualified name to give the module.
+        path: The path to the module's source file.
+        
+    Returns:
+        List[BaseTool]: One instance per tool class defined in the module.
+    """
+    before = set(_tool_subclasses())
+    module = _import_tool_module(module_name, path)
+    if module is None:
+        return []
+    
+    return [
+        cls() for cls in _tool_subclasses()
+        if cls not in before and cls.__module__ == module_name
+    ]
+
+
+def _copy_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy an index metadata dict, including its dependency and tag lists."""
+    return {
+        **metadata,
+        "dependencies": list(metadata.get("dependencies") or []),
+        "tags": list(metadata.get("tags") or [])
+    }
+
+
+class _LazyTool:
+    """Stand-in for a tool whose module has not been imported yet.
+    
+    ``metadata`` and ``to_dict`` are answered from the cached index entry.
+    Any other attribute access imports the module and instantiates the tool
+    class; the registry swaps in the real instance when the tool is fetched
+    through ``get_tool``.
+    """
+    
+    def __init__(self, path: str, module_name: str, class_name: str, tool_info: Dict[str, Any]):
+        self._path = path
+        self._module_name = module_name
+        self._class_name = class_name
+        self._tool_info = tool_info
+        self._metadata: Optional[ToolMetadata] = None
+        self._instance: Optional[BaseTool] = None
+    
+    @property
+    def metadata(self) -> ToolMetadata:
+        """The tool metadata, built from the cached index entry."""
+        if self._instance is not None:
+            return self._instance.metadata
+        if self._metadata is None:
+            fields = dict(self._tool_info["metadata"])
+            fields["created_at"] = datetime.fromisoformat(fields["created_at"])
+            fields["updated_at"] = datetime.fromisoformat(fields["updated_at"])
+            self._metadata = ToolMetadata(**fields)
+        return self._metadata
+    
+    @property
+    def _resolved_category(self) -> str:
+        """The catalog directory of the tool, from the cached index entry."""
+        if self._instance is not None:
+            return self._instance._resolved_category
+        return resolve_category(self._tool_info["metadata"]["category"])
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the cached index entry for the tool."""
+        if self._instance is not None:
+            return self._instance.to_dict()
+        return self._tool_info
+    
+    def _materialize(self) -> BaseTool:
+        """Import the tool module and instantiate the tool class."""
+        if self._instance is None:
+            module = _import_tool_module(self._module_name, self._path)
+            if module is None:
+                raise ImportError(f"Could not load module {self._module_name}")
+            self._instance = getattr(module, self._class_name)()
+        return self._instance
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._materialize(), name)
 
 
 class ToolRegistry:
     """Registry for managing tools in the AutoGen Toolsmith system."""
     
-    def __init__(self, storage_dir: Optional[str] = None):
+    def __init__(self, storage_dir: Optional[str] = None, import_workers: int = 8):
         """Initialize the tool registry.
         
         Args:
             storage_dir: The directory to store tool data. Defaults to the 'tools/catalog' directory.
+            import_workers: The maximum number of threads used to import changed
+                tool modules. With 1, modules are imported in the calling thread.
         """
         if storage_dir is None:
-            # Get the package directory
-            package_dir = Path(__file__).parent.parent
-            storage_dir = package_dir / "tools" / "catalog"
+            storage_dir = _PACKAGE_DIR / "tools" / "catalog"
         
+        self._import_workers = import_workers
         self.storage_dir = Path(storage_dir)
         self.tools: Dict[str, BaseTool] = {}
         self.tool_index: Dict[str, Dict[str, Any]] = {}
+        # Flat view of the index metadata used by list_tools
+        self._metadata_list: List[Dict[str, Any]] = []
+        self._metadata_pos: Dict[str, int] = {}
+        self._category_index: Dict[str, List[int]] = {}
+        self._batch_depth = 0
+        self._index_dirty = False
+        self._source_cache: Dict[str, Tuple[int, str]] = {}
+        # Incremented whenever the set of registered tools changes, so callers
+        # can tell whether results derived from the tools are still current
+        self.generation = 0
+        self._ensure_category_dirs()
         self._load_tools()
     
-    def _load_tools(self):
-        """Load all tools from the storage directory."""
-        self.tools = {}
-        self.tool_index = {}
+    def _ensure_category_dirs(self):
+        """Create the category directories and their ``__init__.py`` files.
         
-        # Ensure category directories exist
-        for category in ["data_tools", "api_tools", "utility_tools"]:
+        Every category a tool can resolve to is created here once, so
+        ``register`` and ``_load_tools`` do not need to check for them.
+        """
+        for category in CATEGORIES:
             category_dir = self.storage_dir / category
             category_dir.mkdir(exist_ok=True, parents=True)
             
@@ -45,44 +189,230 @@ class ToolRegistry:
             init_file = category_dir / "__init__.py"
             if not init_file.exists():
                 init_file.touch()
+    
+    def _load_tools(self):
+        """Load all tools from the storage directory.
+        
+        Files whose mtime and size match the manifest written by the previous
+        load are not imported; their tools are restored from the index entries
+        stored with each file's manifest record and only instantiated when
+        first used. The manifest carries a format version header, and a
+        record that does not match the expected layout simply causes the file
+        to be imported again.
+        
+        Tools are registered in discovery order whether they come from the
+        manifest or from an import, so a name defined in several files
+        resolves the same way on a fresh and on a cached load.
+        """
+        self.tools = {}
+        self.tool_index = {}
+        self._rebuild_metadata_lists()
+        
+        manifest_file = self.storage_dir / "tool_manifest.json"
+        manifest_data = self._read_json(manifest_file)
+        cached_manifest = (
+            manifest_data.get("files", {})
+            if manifest_data.get("version") == _MANIFEST_VERSION else {}
+        )
+        manifest: Dict[str, Dict[str, Any]] = {}
+        # (path, module_name, stat, cached record or None) in discovery order
+        discovered: List[Tuple[str, str, os.stat_result, Optional[Dict[str, Any]]]] = []
+        
+        for category in CATEGORIES:
+            category_dir = self.storage_dir / category
             
             # Check for tool modules in this category
-            for tool_file in category_dir.glob("*.py"):
-                if tool_file.name == "__init__.py":
+            # DirEntry.stat() reuses data from the directory listing where the
+            # platform provides it, and entry.path avoids building Path objects
+            with os.scandir(category_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".py") or entry.name == "__init__.py":
+                        continue
+                    
+                    stat = entry.stat()
+                    module_name = f"autogen_toolsmith.tools.catalog.{category}.{entry.name[:-3]}"
+                    
+                    # Reuse the cached record if the file is unchanged
+                    record = cached_manifest.get(entry.path)
+                    if not (
+                        isinstance(record, dict)
+                        and record.get("mtime_ns") == stat.st_mtime_ns
+                        and record.get("size") == stat.st_size
+                        and self._valid_manifest_tools(record.get("tools"))
+                    ):
+                        record = None
+                    discovered.append((entry.path, module_name, stat, record))
+        
+        # Import changed modules concurrently (unless import_workers is 1);
+        # exec_module is mostly file and import-system IO. Results are
+        # registered below in discovery order, so only this thread ever
+        # touches self.tools.
+        pending = [item for item in discovered if item[3] is None]
+        changed = bool(pending)
+        with ExitStack() as stack:
+            if self._import_workers > 1 and len(pending) > 1:
+                executor = stack.enter_context(
+                    ThreadPoolExecutor(max_workers=min(self._import_workers, len(pending)))
+                )
+                futures = {
+                    path: executor.submit(_load_tool_instances, module_name, path)
+                    for path, module_name, _, _ in pending
+                }
+                
+                def load_instances(path: str, module_name: str) -> List[BaseTool]:
+                    return futures[path].result()
+            else:
+                def load_instances(path: str, module_name: str) -> List[BaseTool]:
+                    return _load_tool_instances(module_name, path)
+            
+            for path, module_name, stat, record in discovered:
+                if record is not None:
+                    for tool_name, entry in record["tools"].items():
+                        self._register_lazy(
+                            tool_name,
+                            _LazyTool(path, module_name, entry["class"], entry["info"]),
+                            entry["info"]
+                        )
+                    manifest[path] = record
                     continue
                 
                 try:
-                    # Load the module
-                    module_name = f"autogen_toolsmith.tools.catalog.{category}.{tool_file.stem}"
-                    spec = importlib.util.spec_from_file_location(module_name, tool_file)
-                    if spec and spec.loader:
-                        module = importlib.util.module_from_spec(spec)
-                        spec.loader.exec_module(module)
-                        
-                        # Find tool classes in the module
-                        for name, obj in inspect.getmembers(module):
-                            if (
-                                inspect.isclass(obj) 
-                                and issubclass(obj, BaseTool) 
-                                and obj is not BaseTool
-                            ):
-                                # Instantiate the tool
-                                tool_instance = obj()
-                                self._register_tool(tool_instance)
+                    found: Dict[str, Dict[str, Any]] = {}
+                    for tool_instance in load_instances(path, module_name):
+                        self._register_tool(tool_instance)
+                        # Each record keeps the file's own entry, even when a
+                        # tool of the same name from another file wins
+                        found[tool_instance.metadata.name] = {
+                            "class": type(tool_instance).__name__,
+                            "info": tool_instance.to_dict()
+                        }
+                    
+                    manifest[path] = {
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "module": module_name,
+                        "tools": found
+                    }
                 except Exception as e:
-                    print(f"Error loading tool from {tool_file}: {e}")
+                    print(f"Error loading tool from {path}: {e}")
+        
+        # Persist the manifest and index so the next load can skip imports.
+        # They are only a cache: if they cannot be written (including tools
+        # whose defaults are not JSON-serializable) the load still succeeds.
+        if changed or manifest.keys() != cached_manifest.keys():
+            try:
+                self._write_index()
+                manifest_file.write_text(
+                    jsonio.dumps({"version": _MANIFEST_VERSION, "files": manifest})
+                )
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Error writing tool manifest: {e}")
+    
+    @contextmanager
+    def batch(self):
+        """Defer ``tool_index.json`` writes until the end of the block.
+        
+        ``register`` and ``remove_tool`` normally rewrite the index on every
+        call; inside a batch the index is written once on exit instead.
+        Batches may be nested.
+        
+        Example:
+            >>> with registry.batch():
+            ...     for tool in tools:
+            ...         registry.register(tool)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._index_dirty:
+                self._write_index()
+    
+    def _flush_index(self):
+        """Write the index file, or mark it dirty when inside a batch."""
+        if self._batch_depth:
+            self._index_dirty = True
+        else:
+            self._write_index()
+    
+    def _write_index(self):
+        """Write ``tool_index.json`` in compact form."""
+        index_file = self.storage_dir / "tool_index.json"
+        index_file.write_text(jsonio.dumps(self.tool_index))
+        self._index_dirty = False
+    
+    @staticmethod
+    def _valid_manifest_tools(tools: Any) -> bool:
+        """Check the ``tools`` field of a manifest record."""
+        return isinstance(tools, dict) and all(
+            isinstance(entry, dict)
+            and isinstance(entry.get("class"), str)
+            and isinstance(entry.get("info"), dict)
+            and "metadata" in entry["info"]
+            for entry in tools.values()
+        )
+    
+    @staticmethod
+    def _read_json(path: Path) -> Dict[str, Any]:
+        """Read a JSON object from a file, returning an empty dict on failure."""
+        try:
+            data = jsonio.loads(path.read_bytes())
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _register_lazy(self, name: str, lazy_tool: _LazyTool, tool_info: Dict[str, Any]):
+        """Register a not-yet-imported tool using its cached index entry."""
+        if name in self.tools:
+            # Same rule as _register_tool: only keep the newer version
+            existing_version = self.tool_index[name]["metadata"]["version"]
+            if existing_version >= tool_info["metadata"]["version"]:
+                return
+        self.tools[name] = lazy_tool
+        self._set_index_entry(name, tool_info)
+    
+    def _set_index_entry(self, name: str, tool_info: Dict[str, Any]):
+        """Store a tool's index entry and keep the flat metadata lists in sync."""
+        self.generation += 1
+        self.tool_index[name] = tool_info
+        metadata = tool_info["metadata"]
+        category = metadata["category"]
+        
+        pos = self._metadata_pos.get(name)
+        if pos is None:
+            pos = len(self._metadata_list)
+            self._metadata_pos[name] = pos
+            self._metadata_list.append(metadata)
+            self._category_index.setdefault(category, []).append(pos)
+            return
+        
+        old_category = self._metadata_list[pos]["category"]
+        self._metadata_list[pos] = metadata
+        if old_category != category:
+            self._category_index[old_category].remove(pos)
+            bisect.insort(self._category_index.setdefault(category, []), pos)
+    
+    def _rebuild_metadata_lists(self):
+        """Rebuild the flat metadata lists from ``tool_index``."""
+        self.generation += 1
+        self._metadata_list = []
+        self._metadata_pos = {}
+        self._category_index = {}
+        for name, tool_info in self.tool_index.items():
+            self._set_index_entry(name, tool_info)
     
     def _register_tool(self, tool: BaseTool):
         """Register a tool with the registry."""
         if tool.metadata.name in self.tools:
             # If the tool already exists, only register the newer version
-            existing_tool = self.tools[tool.metadata.name]
-            if existing_tool.metadata.version < tool.metadata.version:
+            existing_version = self.tool_index[tool.metadata.name]["metadata"]["version"]
+            if existing_version < tool.metadata.version:
                 self.tools[tool.metadata.name] = tool
-                self.tool_index[tool.metadata.name] = tool.to_dict()
+                self._set_index_entry(tool.metadata.name, tool.to_dict())
         else:
             self.tools[tool.metadata.name] = tool
-            self.tool_index[tool.metadata.name] = tool.to_dict()
+            self._set_index_entry(tool.metadata.name, tool.to_dict())
     
     def verify_dependencies(self, tool: BaseTool) -> Tuple[bool, Optional[str]]:
         """Verify that all dependencies of a tool are available in the registry.
@@ -124,23 +454,11 @@ class ToolRegistry:
             
             self._register_tool(tool)
             
-            # Determine the category directory
-            category = tool.metadata.category or "utility_tools"
-            if category not in ["data_tools", "api_tools", "utility_tools"]:
-                category = "utility_tools"
-            
-            category_dir = self.storage_dir / category
-            category_dir.mkdir(exist_ok=True, parents=True)
-            
-            # Create an empty __init__.py file if it doesn't exist
-            init_file = category_dir / "__init__.py"
-            if not init_file.exists():
-                init_file.touch()
+            # Cached module-level lookups may now be stale
+            get_tool.cache_clear()
             
             # Update the tool index file
-            index_file = self.storage_dir / "tool_index.json"
-            with open(index_file, 'w') as f:
-                json.dump(self.tool_index, f, indent=2)
+            self._flush_index()
             
             return True
         except Exception as e:
@@ -156,7 +474,15 @@ class ToolRegistry:
         Returns:
             Optional[BaseTool]: The tool, or None if it doesn't exist.
         """
-        return self.tools.get(name)
+        tool = self.tools.get(name)
+        if isinstance(tool, _LazyTool):
+            try:
+                tool = tool._materialize()
+            except Exception as e:
+                print(f"Error loading tool {name}: {e}")
+                return None
+            self.tools[name] = tool
+        return tool
     
     def list_tools(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """List all registered tools.
@@ -165,14 +491,42 @@ class ToolRegistry:
             category: Filter by category.
             
         Returns:
-            List[Dict[str, Any]]: List of tool metadata.
+            List[Dict[str, Any]]: List of tool metadata. Each dict is a fresh
+                copy that the caller may modify.
         """
+        # Served from the flat metadata lists so that listing never imports
+        # tool modules or walks the tools. The lists hold the index's own
+        # dicts, so callers get copies.
+        metadata_list = self._metadata_list
         if not category:
-            return [t.to_dict()["metadata"] for t in self.tools.values()]
-        return [
-            t.to_dict()["metadata"] for t in self.tools.values() 
-            if t.metadata.category == category
-        ]
+            return [_copy_metadata(metadata) for metadata in metadata_list]
+        return [_copy_metadata(metadata_list[i]) for i in self._category_index.get(category, ())]
+    
+    def get_tool_info(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get a tool's index entry without importing the tool.
+        
+        Args:
+            name: The name of the tool.
+            
+        Returns:
+            Optional[Dict[str, Any]]: A copy of the tool's ``to_dict()`` entry,
+                or None if the tool doesn't exist.
+        """
+        tool_info = self.tool_index.get(name)
+        if tool_info is None:
+            return None
+        signature = tool_info["signature"]
+        return {
+            **tool_info,
+            "metadata": _copy_metadata(tool_info["metadata"]),
+            "signature": {
+                **signature,
+                "parameters": {
+                    param_name: dict(param)
+                    for param_name, param in signature["parameters"].items()
+                }
+            }
+        }
     
     def remove_tool(self, name: str) -> bool:
         """Remove a tool from the registry.
@@ -184,14 +538,14 @@ class ToolRegistry:
             bool: True if removal was successful, False otherwise.
         """
         if name in self.tools:
-            tool = self.tools[name]
-            category = tool.metadata.category or "utility_tools"
-            if category not in ["data_tools", "api_tools", "utility_tools"]:
-                category = "utility_tools"
+            category = self.tools[name]._resolved_category
             
             # Remove the tool from memory
             del self.tools[name]
             del self.tool_index[name]
+            self._rebuild_metadata_lists()
+            self._source_cache.pop(name, None)
+            get_tool.cache_clear()
             
             # Remove the tool's Python file
             tool_file = self.storage_dir / category / f"{name}.py"
@@ -199,9 +553,7 @@ class ToolRegistry:
                 tool_file.unlink()
             
             # Update the tool index file
-            index_file = self.storage_dir / "tool_index.json"
-            with open(index_file, 'w') as f:
-                json.dump(self.tool_index, f, indent=2)
+            self._flush_index()
             
             return True
         
@@ -217,26 +569,41 @@ class ToolRegistry:
             Optional[str]: The source code, or None if the tool doesn't exist.
         """
         if name in self.tools:
-            tool = self.tools[name]
-            category = tool.metadata.category or "utility_tools"
-            if category not in ["data_tools", "api_tools", "utility_tools"]:
-                category = "utility_tools"
+            category = self.tools[name]._resolved_category
             
-            # Get the tool's Python file
+            # Get the tool's Python file, reusing the cached source while
+            # the file's mtime is unchanged
             tool_file = self.storage_dir / category / f"{name}.py"
-            if tool_file.exists():
-                with open(tool_file, 'r') as f:
-                    return f.read()
+            try:
+                mtime_ns = os.stat(tool_file).st_mtime_ns
+            except OSError:
+                return None
+            
+            cached = self._source_cache.get(name)
+            if cached and cached[0] == mtime_ns:
+                return cached[1]
+            
+            with open(tool_file, 'r') as f:
+                source = f.read()
+            self._source_cache[name] = (mtime_ns, source)
+            return source
         
         return None
 
 
-# Create a global registry instance
-registry = ToolRegistry()
+# Create a global registry instance. This runs while this module is still
+# being imported, so tool modules are imported in this thread: a worker thread
+# importing a tool that imports autogen_toolsmith (or calls get_tool) would
+# wait for this module's import lock while this thread waits for the worker.
+registry = ToolRegistry(import_workers=1)
 
+@lru_cache(maxsize=128)
 def get_tool(name: str) -> Optional[BaseTool]:
     """Get a tool by name.
     
+    Results are cached; the cache is cleared whenever a tool is registered
+    or removed.
+    
     Args:
         name: The name of the tool to get.
         
@@ -254,4 +621,29 @@ def list_tools(category: Optional[str] = None) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: List of tool metadata.
     """
-    return registry.list_tools(category) 
\ No newline at end of file
+    return registry.list_tools(category) 
+
+def init_registry(storage_dirs: List[str]) -> ToolRegistry:
+    """Add the tools stored in additional directories to the global registry.
+    
+    Each directory uses the same layout as the catalog (one sub-directory
+    per category). A tool that is already registered is only replaced by a
+    newer version, as when loading a single directory.
+    
+    Args:
+        storage_dirs: The directories to load tools from.
+        
+    Returns:
+        ToolRegistry: The global registry.
+    """
+    for storage_dir in storage_dirs:
+        extra = ToolRegistry(storage_dir)
+        for name, tool in extra.tools.items():
+            if isinstance(tool, _LazyTool):
+                registry._register_lazy(name, tool, extra.tool_index[name])
+            else:
+                registry._register_tool(tool)
+    
+    # Cached module-level lookups may now be stale
+    get_tool.cache_clear()
+    return registry
@@ -2,13 +2,44 @@
 Version control for tools in the AutoGen Toolsmith system.
 """
 
-import json
 import os
+import shutil
+from itertools import islice
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Set, Any
 
-from autogen_toolsmith.tools.base.tool_base import BaseTool
+from autogen_toolsmith.storage import _PACKAGE_DIR, jsonio
+from autogen_toolsmith.tools.base.tool_base import BaseTool, resolve_category
+
+
+def _read_lines_backwards(path: Path, block_size: int = 8192) -> Iterator[bytes]:
+    """Yield the lines of a file from last to first.
+    
+    The file is read in blocks from the end, so only the part needed to
+    produce the lines actually consumed is read.
+    
+    Args:
+        path: The file to read.
+        block_size: The number of bytes to read at a time.
+        
+    Yields:
+        bytes: Each line without its trailing newline, last line first.
+    """
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            lines = (f.read(read_size) + remainder).split(b"\n")
+            # The first piece may be the tail of a line that starts in an
+            # earlier block
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                yield line
+        yield remainder
 
 
 class ToolVersionManager:
@@ -21,12 +52,11 @@ class ToolVersionManager:
             versions_dir: The directory to store version data. Defaults to 'versions' in the package directory.
         """
         if versions_dir is None:
-            # Get the package directory
-            package_dir = Path(__file__).parent.parent
-            versions_dir = package_dir / "storage" / "versions"
+            versions_dir = _PACKAGE_DIR / "storage" / "versions"
         
         self.versions_dir = Path(versions_dir)
         self.versions_dir.mkdir(exist_ok=True, parents=True)
+        self._category_dirs_ready: Set[str] = set()
     
     def save_version(self, tool: BaseTool, source_code: str, commit_message: str = ""):
         """Save a new version of a tool.
@@ -48,56 +78,69 @@ class ToolVersionManager:
         
         # Save the source code
         source_file = tool_dir / f"{version_id}.py"
-        with open(source_file, 'w') as f:
-            f.write(source_code)
+        source_file.write_text(source_code)
         
         # Save the metadata
-        metadata = tool.to_dict()
+        metadata = dict(tool.to_dict())
         metadata["commit_message"] = commit_message
         metadata["timestamp"] = timestamp
         
         metadata_file = tool_dir / f"{version_id}.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
-        
-        # Update the version history
-        history_file = tool_dir / "history.json"
-        history = []
-        if history_file.exists():
-            with open(history_file, 'r') as f:
-                history = json.load(f)
+        metadata_file.write_text(jsonio.dumps(metadata))
         
-        history.append({
+        # Append to the version history (one JSON object per line)
+        entry = {
             "version_id": version_id,
             "version": tool.metadata.version,
             "timestamp": timestamp,
             "commit_message": commit_message,
             "author": tool.metadata.author
-        })
-        
-        with open(history_file, 'w') as f:
-            json.dump(history, f, indent=2)
+        }
+        with open(self._history_file(tool_dir), 'a') as f:
+            f.write(jsonio.dumps(entry) + "\n")
         
         return version_id
     
-    def get_version_history(self, tool_name: str) -> List[Dict[str, Any]]:
+    def _history_file(self, tool_dir: Path) -> Path:
+        """Get the history file for a tool, migrating the legacy format.
+        
+        History used to be stored as a JSON array in ``history.json``; it is
+        converted to ``history.jsonl`` the first time it is accessed.
+        
+        Args:
+            tool_dir: The tool's version directory.
+            
+        Returns:
+            Path: The path to ``history.jsonl``.
+        """
+        history_file = tool_dir / "history.jsonl"
+        legacy_file = tool_dir / "history.json"
+        if legacy_file.exists() and not history_file.exists():
+            history = jsonio.loads(legacy_file.read_bytes())
+            history_file.write_text("".join(
+                jsonio.dumps(entry) + "\n" for entry in history
+            ))
+            legacy_file.unlink()
+        return history_file
+    
+    def get_version_history(self, tool_name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get the version history for a tool.
         
         Args:
             tool_name: The name of the tool.
+            limit: Maximum number of entries to return. If None, returns all.
             
         Returns:
             List[Dict[str, Any]]: The version history, newest first.
         """
-        tool_dir = self.versions_dir / tool_name
-        history_file = tool_dir / "history.json"
+        history_file = self._history_file(self.versions_dir / tool_name)
         
-        if history_file.exists():
-            with open(history_file, 'r') as f:
-                history = json.load(f)
-            return list(reversed(history))  # Newest first
+        if not history_file.exists():
+            return []
         
-        return []
+        # Newest first: read the file backwards and stop after `limit` entries
+        lines = (line for line in _read_lines_backwards(history_file) if line.strip())
+        return [jsonio.loads(line) for line in islice(lines, limit)]
     
     def get_version(self, tool_name: str, version_id: str) -> Optional[Dict[str, Any]]:
         """Get a specific version of a tool.
@@ -117,8 +160,7 @@ class ToolVersionManager:
             with open(source_file, 'r') as f:
                 source_code = f.read()
             
-            with open(metadata_file, 'r') as f:
-                metadata = json.load(f)
+            metadata = jsonio.loads(metadata_file.read_bytes())
             
             return {
                 "metadata": metadata,
@@ -137,31 +179,39 @@ class ToolVersionManager:
         Returns:
             Optional[str]: The path to the restored tool file, or None if the version doesn't exist.
         """
-        version = self.get_version(tool_name, version_id)
-        if not version:
+        tool_dir = self.versions_dir / tool_name
+        source_file = tool_dir / f"{version_id}.py"
+        metadata_file = tool_dir / f"{version_id}.json"
+        
+        # Only the metadata is parsed; the source is copied as bytes below
+        if not (source_file.exists() and metadata_file.exists()):
             return None
+        metadata = jsonio.loads(metadata_file.read_bytes())
         
         # Get the category from the metadata
-        category = version["metadata"]["metadata"]["category"] or "utility_tools"
-        if category not in ["data_tools", "api_tools", "utility_tools"]:
-            category = "utility_tools"
-        
-        # Get the package directory
-        package_dir = Path(__file__).parent.parent
-        category_dir = package_dir / "tools" / "catalog" / category
-        
-        # Ensure the category directory exists
-        category_dir.mkdir(exist_ok=True, parents=True)
-        
-        # Create an empty __init__.py file if it doesn't exist
-        init_file = category_dir / "__init__.py"
-        if not init_file.exists():
-            init_file.touch()
-        
-        # Save the source code
+        category = resolve_category(metadata["metadata"]["category"])
+        category_dir = _PACKAGE_DIR / "tools" / "catalog" / category
+        
+        # Ensure the category directory and its __init__.py exist, once per
+        # category for the lifetime of the manager
+        if category not in self._category_dirs_ready:
+            category_dir.mkdir(exist_ok=True, parents=True)
+            init_file = category_dir / "__init__.py"
+            if not init_file.exists():
+                init_file.touch()
+            self._category_dirs_ready.add(category)
+        
+        # Copy the source next to the tool file, then rename it into place so
+        # the tool file is never left half-written
         tool_file = category_dir / f"{tool_name}.py"
-        with open(tool_file, 'w') as f:
-            f.write(version["source_code"])
+        tmp_file = tool_file.with_suffix(".py.tmp")
+        try:
+            shutil.copyfile(source_file, tmp_file)
+            os.replace(tmp_file, tool_file)
+        except OSError:
+            if tmp_file.exists():
+                tmp_file.unlink()
+            raise
         
         return str(tool_file)
 
@@ -2,23 +2,48 @@
 Tools for AutoGen Toolsmith.
 """
 
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 
 # 移除循环导入
 # from autogen_toolsmith.storage.registry import get_tool, list_tools
 from autogen_toolsmith.tools.base.tool_base import BaseTool, FunctionTool, ClassTool
 
+# 注册表在首次使用时解析并缓存（在模块加载时导入会造成循环导入）
+_get_tool = None
+_list_tools = None
+_registry = None
+
+# get_all_tools_as_functions 的结果缓存：category -> (registry.generation, functions)
+_functions_cache: Dict[Optional[str], Tuple[int, List[Callable]]] = {}
+# enumerate_tools 的结果缓存：categories -> (registry.generation, functions by category)
+_enumerate_cache: Dict[Optional[Tuple[str, ...]], Tuple[int, Dict[str, List[Callable]]]] = {}
+
+
+def _get_registry():
+    """Return the global tool registry, importing it on first use."""
+    global _registry
+    if _registry is None:
+        from autogen_toolsmith.storage.registry import registry as _registry
+    return _registry
+
 # 创建转发函数而不是直接导入
 def get_tool(name: str) -> Optional[BaseTool]:
     """Get a tool by name.
     
+    The first call replaces this module's ``get_tool`` with the registry's
+    cached lookup, so later ``from autogen_toolsmith.tools import get_tool``
+    imports call it directly without going through this forwarder.
+    
     Args:
         name: The name of the tool to get.
         
     Returns:
         Optional[BaseTool]: The tool, or None if it doesn't exist.
     """
-    from autogen_toolsmith.storage.registry import get_tool as _get_tool
+    global _get_tool, get_tool
+    if _get_tool is None:
+        from autogen_toolsmith.storage.registry import get_tool as _get_tool
+        get_tool = _get_tool
     return _get_tool(name)
 
 def list_tools(category: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -30,7 +55,9 @@ def list_tools(category: Optional[str] = None) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: List of tool metadata.
     """
-    from autogen_toolsmith.storage.registry import list_tools as _list_tools
+    global _list_tools
+    if _list_tools is None:
+        from autogen_toolsmith.storage.registry import list_tools as _list_tools
     return _list_tools(category)
 
 def get_all_tools_as_functions(category: Optional[str] = None) -> List[Callable]:
@@ -38,6 +65,7 @@ def get_all_tools_as_functions(category: Optional[str] = None) -> List[Callable]
     
     This function returns all registered tools (or tools from a specific category)
     converted to standalone functions that can be directly used with AutoGen agents.
+    The list is cached per category until a tool is registered or removed.
     
     Args:
         category: Optional category to filter tools by. If None, returns all tools.
@@ -45,7 +73,11 @@ def get_all_tools_as_functions(category: Optional[str] = None) -> List[Callable]
     Returns:
         List[Callable]: List of callable functions that wrap the tools.
     """
-    from autogen_toolsmith.storage.registry import registry
+    registry = _get_registry()
+    cached = _functions_cache.get(category)
+    if cached is not None and cached[0] == registry.generation:
+        return list(cached[1])
+    
     tools_list = []
     
     # Get all tools or filter by category
@@ -58,13 +90,15 @@ def get_all_tools_as_functions(category: Optional[str] = None) -> List[Callable]
         # Use the helper function to create a tool function
         tools_list.append(make_tool_function(tool))
     
-    return tools_list
+    _functions_cache[category] = (registry.generation, tools_list)
+    return list(tools_list)
 
 def enumerate_tools(categories: Optional[List[str]] = None) -> Dict[str, List[Callable]]:
     """Enumerate all tools by category and convert them to callable functions.
     
     This function returns all registered tools organized by category and
     converted to functions that can be directly used with AutoGen agents.
+    The result is cached until a tool is registered or removed.
     
     Args:
         categories: Optional list of categories to include. If None, returns all categories.
@@ -72,7 +106,11 @@ def enumerate_tools(categories: Optional[List[str]] = None) -> Dict[str, List[Ca
     Returns:
         Dict[str, List[Callable]]: Dictionary with categories as keys and lists of callable functions as values.
     """
-    from autogen_toolsmith.storage.registry import registry
+    registry = _get_registry()
+    cache_key = tuple(categories) if categories else None
+    cached = _enumerate_cache.get(cache_key)
+    if cached is not None and cached[0] == registry.generation:
+        return {category: list(functions) for category, functions in cached[1].items()}
     
     # Get all available categories from registered tools
     all_categories = set(tool.metadata.category for tool in registry.tools.values() 
@@ -93,7 +131,8 @@ def enumerate_tools(categories: Optional[List[str]] = None) -> Dict[str, List[Ca
     if uncategorized:
         result["uncategorized"] = [make_tool_function(tool) for tool in uncategorized]
     
-    return result
+    _enumerate_cache[cache_key] = (registry.generation, result)
+    return {category: list(functions) for category, functions in result.items()}
 
 def make_tool_function(tool_instance):
     """Helper function to convert a tool instance to a callable function.
@@ -102,8 +141,15 @@ def make_tool_function(tool_instance):
         tool_instance: The BaseTool instance to convert.
         
     Returns:
-        Callable: A function that wraps the tool's run method.
+        Callable: A function that wraps the tool's run method. The same
+            wrapper is returned for repeated calls with the same instance.
     """
+    # Reuse the wrapper stored on the instance; vars() avoids triggering a
+    # lazy registry entry's attribute forwarding
+    cached = vars(tool_instance).get("_tool_function")
+    if cached is not None:
+        return cached
+    
     # Create the wrapper function with the tool's docstring
     def tool_function(*args, **kwargs):
         """Tool function wrapper."""
@@ -114,6 +160,7 @@ def make_tool_function(tool_instance):
     tool_function.__name__ = tool_instance.metadata.name
     tool_function.__doc__ = tool_instance.metadata.description
     
+    tool_instance._tool_function = tool_function
     return tool_function
 
 __all__ = ["get_tool", "list_tools", "BaseTool", "FunctionTool", "ClassTool",
@@ -3,15 +3,122 @@ Base classes for all tools in the AutoGen Toolsmith system.
 """
 
 import inspect
+import sys
+import types
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import Any, Dict, List, Optional, Tuple, Union, Callable
 
+# ToolMetadata uses __slots__ where dataclasses support it (Python 3.10+):
+# smaller instances and faster attribute reads for large registries
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Categories that have a storage directory in the tool catalog, in the order
+# their directories are loaded
+CATEGORIES = ("data_tools", "api_tools", "utility_tools")
+VALID_CATEGORIES = frozenset(CATEGORIES)
+
+
+def resolve_category(category: Optional[str]) -> str:
+    """Map a tool category to the catalog directory it is stored in.
+    
+    Args:
+        category: The category from the tool metadata.
+        
+    Returns:
+        str: The category itself if it is valid, otherwise "utility_tools".
+    """
+    return category if category in VALID_CATEGORIES else "utility_tools"
+
+
+def _type_name(annotation: Any) -> str:
+    """Return the name used for an annotation in a tool signature."""
+    return annotation.__name__ if annotation is not inspect.Parameter.empty else "Any"
+
+
+def _describe_callable(func: Callable, skip_self: bool) -> Tuple[Dict[str, Dict[str, Any]], str]:
+    """Describe the parameters and return type of a callable.
+    
+    Plain Python functions and methods are read straight from the code
+    object, ``__defaults__``, ``__kwdefaults__`` and ``__annotations__``;
+    anything else (builtins, partials, wrapped or callable objects) goes
+    through ``inspect.signature``. Both give the same result.
+    
+    Args:
+        func: The callable to describe.
+        skip_self: Whether to leave out a parameter named "self".
+        
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], str]: The "parameters" and "returns"
+            entries of a tool signature.
+    """
+    empty = inspect.Parameter.empty
+    bound = isinstance(func, types.MethodType)
+    function = func.__func__ if bound else func
+    
+    if (
+        not isinstance(function, types.FunctionType)
+        or hasattr(function, "__wrapped__")
+        or hasattr(function, "__signature__")
+        or (bound and not function.__code__.co_argcount)
+    ):
+        sig = inspect.signature(func)
+        parameters = [(name, param.annotation, param.default) for name, param in sig.parameters.items()]
+        return_annotation = sig.return_annotation
+    else:
+        code = function.__code__
+        names = code.co_varnames
+        positional = code.co_argcount
+        keyword_only = code.co_kwonlyargcount
+        annotations = function.__annotations__
+        defaults = function.__defaults__ or ()
+        kwdefaults = function.__kwdefaults__ or {}
+        first_default = positional - len(defaults)
+        
+        # co_varnames lists positional, then keyword-only, then *args and
+        # **kwargs; a signature puts *args before the keyword-only names
+        ordered = [
+            (names[i], defaults[i - first_default] if i >= first_default else empty)
+            for i in range(positional)
+        ]
+        extra = positional + keyword_only
+        if code.co_flags & inspect.CO_VARARGS:
+            ordered.append((names[extra], empty))
+            extra += 1
+        ordered.extend(
+            (name, kwdefaults.get(name, empty))
+            for name in names[positional:positional + keyword_only]
+        )
+        if code.co_flags & inspect.CO_VARKEYWORDS:
+            ordered.append((names[extra], empty))
+        
+        if bound:
+            # The first parameter is bound to the instance
+            ordered = ordered[1:]
+        
+        parameters = [(name, annotations.get(name, empty), default) for name, default in ordered]
+        return_annotation = annotations.get("return", empty)
+    
+    return {
+        name: {
+            "type": _type_name(annotation),
+            "description": "",  # Would be populated from docstring
+            "default": None if default is empty else default
+        }
+        for name, annotation, default in parameters
+        if not (skip_self and name == "self")
+    }, _type_name(return_annotation)
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ToolMetadata:
-    """Metadata for a tool."""
+    """Metadata for a tool.
+    
+    Treat it as read-only once the tool is constructed (BaseTool caches its
+    serialized form). It is not frozen so that tool code written against
+    the earlier, mutable class keeps working.
+    """
     name: str
     description: str
     version: str
@@ -51,6 +158,11 @@ class BaseTool(ABC):
             tags=tags or [],
             category=category or "uncategorized"
         )
+        # Built by the first to_dict call; the metadata must not change after that
+        self._dict_cache: Optional[Dict[str, Any]] = None
+        self._signature_cache: Optional[Tuple[Dict[str, Dict[str, Any]], str]] = None
+        # The catalog directory for this tool, see resolve_category
+        self._resolved_category = resolve_category(self.metadata.category)
     
     @abstractmethod
     def run(self, *args, **kwargs) -> Any:
@@ -59,24 +171,43 @@ class BaseTool(ABC):
     
     def get_signature(self) -> Dict[str, Any]:
         """Get the signature of the tool's run method."""
-        sig = inspect.signature(self.run)
+        return self._build_signature(self.run, skip_self=True)
+    
+    def _build_signature(self, func: Callable, skip_self: bool) -> Dict[str, Any]:
+        """Build a signature dict for the callable behind the tool.
+        
+        The parameter description does not change over the tool's lifetime,
+        so it is computed on first use and shared by later calls.
+        
+        Args:
+            func: The callable the tool runs.
+            skip_self: Whether to leave out a parameter named "self".
+            
+        Returns:
+            Dict[str, Any]: The tool signature.
+        """
+        if self._signature_cache is None:
+            self._signature_cache = _describe_callable(func, skip_self)
+        parameters, returns = self._signature_cache
         return {
             "name": self.metadata.name,
             "description": self.metadata.description,
-            "parameters": {
-                name: {
-                    "type": param.annotation.__name__ if param.annotation is not inspect.Parameter.empty else "Any",
-                    "description": "",  # Would be populated from docstring
-                    "default": None if param.default is inspect.Parameter.empty else param.default
-                }
-                for name, param in sig.parameters.items()
-                if name != "self"
-            },
-            "returns": sig.return_annotation.__name__ if sig.return_annotation is not inspect.Parameter.empty else "Any"
+            "parameters": parameters,
+            "returns": returns
         }
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert the tool to a dictionary for serialization."""
+        """Convert the tool to a dictionary for serialization.
+        
+        The metadata must not be modified after the tool is constructed, so
+        the result is computed once and cached; copy it before modifying.
+        """
+        if self._dict_cache is None:
+            self._dict_cache = self._build_dict()
+        return self._dict_cache
+    
+    def _build_dict(self) -> Dict[str, Any]:
+        """Build the serialized form of the tool."""
         return {
             "metadata": {
                 "name": self.metadata.name,
@@ -123,20 +254,7 @@ class FunctionTool(BaseTool):
     
     def get_signature(self) -> Dict[str, Any]:
         """Get the signature of the wrapped function."""
-        sig = inspect.signature(self.func)
-        return {
-            "name": self.metadata.name,
-            "description": self.metadata.description,
-            "parameters": {
-                name: {
-                    "type": param.annotation.__name__ if param.annotation is not inspect.Parameter.empty else "Any",
-                    "description": "",  # Would need to parse from docstring
-                    "default": None if param.default is inspect.Parameter.empty else param.default
-                }
-                for name, param in sig.parameters.items()
-            },
-            "returns": sig.return_annotation.__name__ if sig.return_annotation is not inspect.Parameter.empty else "Any"
-        }
+        return self._build_signature(self.func, skip_self=False)
 
 
 class ClassTool(BaseTool):
@@ -173,18 +291,4 @@ class ClassTool(BaseTool):
     
     def get_signature(self) -> Dict[str, Any]:
         """Get the signature of the wrapped method."""
-        sig = inspect.signature(self.method)
-        return {
-            "name": self.metadata.name,
-            "description": self.metadata.description,
-            "parameters": {
-                name: {
-                    "type": param.annotation.__name__ if param.annotation is not inspect.Parameter.empty else "Any",
-                    "description": "",  # Would need to parse from docstring
-                    "default": None if param.default is inspect.Parameter.empty else param.default
-                }
-                for name, param in sig.parameters.items()
-                if name != "self"  # Skip the self parameter
-            },
-            "returns": sig.return_annotation.__name__ if sig.return_annotation is not inspect.Parameter.empty else "Any"
-        } 
\ No newline at end of file
+        return self._build_signature(self.method, skip_self=True)
@@ -11,43 +11,36 @@ import os
 import sys
 import json
 import asyncio
+import compileall
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Dict, Any, Optional
 
-from autogen_toolsmith.generator.code_validator import CodeValidator
+# autogen、httpx 和 dotenv 在用到它们的函数中导入，导入本模块时不产生额外开销
+if TYPE_CHECKING:
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
 
-# 加载.env文件中的环境变量
-load_dotenv()
 
-# Add the parent directory to the Python path
-parent_dir = Path(__file__).parent.parent
-sys.path.append(str(parent_dir))
+# 模型名称，同时用作响应缓存的键
+_MODEL = "anthropic/claude-3.7-sonnet"
 
-# Import required packages
-from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
-from autogen_agentchat.messages import TextMessage
-from autogen_agentchat.ui import Console
-from autogen_core import CancellationToken
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_toolsmith import ToolGenerator, get_tool
-from autogen_toolsmith.tools import BaseTool, get_all_tools_as_functions
 
-
-async def create_demo_tool():
-    """Create a demo date manipulation tool."""
-    spec = """
-    Create a tool that can get the current date and time
-    The output should be a string in the format of "2025-03-03 10:00:00"
+@lru_cache(maxsize=1)
+def _get_model_client() -> "OpenAIChatCompletionClient":
+    """Return the shared model client, creating it on first use.
+    
+    Returns:
+        OpenAIChatCompletionClient: The client for the OpenRouter API.
     """
+    import httpx
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
     
     api_key = os.environ.get("OPENROUTER_API_KEY")
     if not api_key:
         raise ValueError("请设置OPENAI_API_KEY环境变量")
     
-    # 创建模型客户端
-    model_client = OpenAIChatCompletionClient(
-        model="anthropic/claude-3.7-sonnet",
+    return OpenAIChatCompletionClient(
+        model=_MODEL,
         api_key=api_key,
         base_url="https://openrouter.ai/api/v1",
         model_info={
@@ -59,18 +52,47 @@ async def create_demo_tool():
         llm_config={
             "cache_seed": 42,
             "cache_path_root": "./cache",
-        }
+        },
+        # 所有调用共用一个连接池，后续请求复用已建立的 keep-alive 连接
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+        )
     )
+
+
+async def create_demo_tool():
+    """Create a demo date manipulation tool."""
+    from autogen_toolsmith import ToolGenerator
+    
+    spec = """
+    Create a tool that can get the current date and time
+    The output should be a string in the format of "2025-03-03 10:00:00"
+    """
     
-    generator = ToolGenerator(model_client=model_client)
+    # 获取共享的模型客户端
+    model_client = _get_model_client()
+    
+    # 相同的提示直接使用 ./cache 中缓存的模型响应
+    generator = ToolGenerator(model_client=model_client, cache_dir="./cache", cache_model=_MODEL)
     
     # 创建工具
     toolname = await generator.create_tool(spec, output_dir="./tools")
     print(f"Tool created at: {toolname}")
+    
+    # 预先编译生成的文件，首次导入时直接使用 __pycache__ 中的字节码
+    compileall.compile_dir("./tools", quiet=1, workers=0)
 
     await generator.run_tests_and_update(toolname, output_dir="./tools")
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    
+    # 加载.env文件中的环境变量
+    load_dotenv()
+    
+    # Add the parent directory to the Python path
+    sys.path.append(str(Path(__file__).parent.parent))
+    
     asyncio.run(create_demo_tool()) 
     # asyncio.run(test_tool())
     # asyncio.run(test_tool())
\ No newline at end of file
@@ -8,24 +8,34 @@
 """
 
 import asyncio
+import compileall
 import os
+from functools import lru_cache
 from pathlib import Path
+import httpx
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 from autogen_toolsmith.generator import ToolGenerator
 from dotenv import load_dotenv
 
-async def main():
-    # 加载环境变量
-    load_dotenv()
-    
+# 所有调用共用一个连接池，后续请求复用已建立的 keep-alive 连接
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+
+
+# 模型名称，同时用作响应缓存的键
+_MODEL = "anthropic/claude-3.7-sonnet"
+
+
+@lru_cache(maxsize=1)
+def _get_model_client() -> OpenAIChatCompletionClient:
+    """返回共享的模型客户端，首次调用时创建."""
     # 获取API密钥和模型名称
     api_key = os.environ.get("OPENROUTER_API_KEY")
     if not api_key:
         raise ValueError("请设置OPENAI_API_KEY环境变量")
     
     # 创建模型客户端
-    model_client = OpenAIChatCompletionClient(
-        model="anthropic/claude-3.7-sonnet",
+    return OpenAIChatCompletionClient(
+        model=_MODEL,
         api_key=api_key,
         base_url="https://openrouter.ai/api/v1",
         model_info={
@@ -37,8 +47,16 @@ async def main():
         llm_config={
             "cache_seed": 42,
             "cache_path_root": "./cache",
-        }
+        },
+        http_client=httpx.AsyncClient(limits=_HTTP_LIMITS)
     )
+
+async def main():
+    # 加载环境变量
+    load_dotenv()
+    
+    # 获取共享的模型客户端
+    model_client = _get_model_client()
     
     # Define multiple storage directories
     project_dir = Path.cwd() / "my_project"
@@ -51,8 +69,9 @@ async def main():
     # Initialize registry with multiple directories
     storage_dirs = [str(project_dir), str(shared_dir)]
     
-    # Create a tool generator with custom storage directories
-    generator = ToolGenerator(model_client=model_client, storage_dirs=storage_dirs)
+    # Create a tool generator with custom storage directories; responses to
+    # prompts that were already sent are reused from ./cache
+    generator = ToolGenerator(model_client=model_client, storage_dirs=storage_dirs, cache_dir="./cache", cache_model=_MODEL)
     
     # Create a tool in the project directory
     tool_spec = """
@@ -62,15 +81,6 @@ async def main():
     3. Calculate reading time
     """
     
-    tool_path = await generator.create_tool(
-        specification=tool_spec,
-        output_dir=str(project_dir),  # Save to project directory
-        register=True
-    )
-    
-    if tool_path:
-        print(f"Tool created successfully at: {tool_path}")
-    
     # Create another tool in the shared directory
     shared_tool_spec = """
     Create a file utility tool that can:
@@ -79,15 +89,23 @@ async def main():
     3. Calculate directory size
     """
     
-    shared_tool_path = await generator.create_tool(
-        specification=shared_tool_spec,
-        output_dir=str(shared_dir),  # Save to shared directory
+    # 两个工具写入不同目录、互不依赖，一次批量并发生成
+    tool_path, shared_tool_path = await generator.create_tools_batch(
+        [tool_spec, shared_tool_spec],
+        output_dirs=[str(project_dir), str(shared_dir)],  # Project and shared directories
         register=True
     )
     
+    if tool_path:
+        print(f"Tool created successfully at: {tool_path}")
+    
     if shared_tool_path:
         print(f"Shared tool created successfully at: {shared_tool_path}")
     
+    # 预先编译生成的文件，首次导入时直接使用 __pycache__ 中的字节码
+    for output_dir in (project_dir, shared_dir):
+        compileall.compile_dir(output_dir, quiet=1, workers=0)
+    
     # Update the tool in the project directory
     update_spec = """
     Add the following features to the text processing tool:
@@ -9,65 +9,121 @@
 3. 在AutoGen Agent中使用这些工具
 """
 
+import argparse
 import os
 import sys
-import json
 import asyncio
+import functools
 from pathlib import Path
-from typing import Dict, Any, List, Callable, Optional
-from dotenv import load_dotenv
-
-# 加载.env文件中的环境变量
-load_dotenv()
+from typing import TYPE_CHECKING, Dict, List, Callable, Optional
 
 # 添加父目录到Python路径
 parent_dir = Path(__file__).parent.parent
 sys.path.append(str(parent_dir))
 
-# 导入所需包
-from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
-from autogen_agentchat.messages import TextMessage
-from autogen_agentchat.ui import Console
-from autogen_core import CancellationToken
-from autogen_ext.models.openai import OpenAIChatCompletionClient
-from autogen_toolsmith import ToolGenerator
+# 导入所需包；autogen 和 dotenv 在用到它们的函数中导入，只列出工具时不加载
 from autogen_toolsmith.tools import get_all_tools_as_functions, enumerate_tools
 
+if TYPE_CHECKING:
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
 
-def print_available_tools():
-    """打印所有可用工具的信息."""
-    # 获取所有工具作为函数列表
-    all_tools = get_all_tools_as_functions()
+# 同一轮对话中最多同时执行的工具调用数量
+_TOOL_CONCURRENCY = 10
+
+
+def as_async_tools(tool_functions: List[Callable]) -> List[Callable]:
+    """将同步工具函数包装为在线程中执行的协程函数.
+    
+    助手在一轮中发起多个工具调用时，这些调用可以并发执行，
+    并由信号量限制同时运行的数量。需要在事件循环中调用。
+    
+    Args:
+        tool_functions: get_all_tools_as_functions() 等返回的工具函数。
+        
+    Returns:
+        List[Callable]: 包装后的协程函数，名称和文档与原函数相同。
+    """
+    semaphore = asyncio.Semaphore(_TOOL_CONCURRENCY)
+    
+    def wrap(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def async_tool(*args, **kwargs):
+            async with semaphore:
+                return await asyncio.to_thread(func, *args, **kwargs)
+        return async_tool
+    
+    return [wrap(func) for func in tool_functions]
+
+
+def format_tool_list(tool_functions: List[Callable]) -> str:
+    """生成系统提示中的工具列表，每个工具一行.
+    
+    只取文档字符串的第一行作为摘要，使提示简短且格式稳定。
+    
+    Args:
+        tool_functions: 要列出的工具函数。
+        
+    Returns:
+        str: "- 名称: 摘要" 形式的多行文本。
+    """
+    lines = []
+    for tool in tool_functions:
+        doc_lines = (tool.__doc__ or "").strip().splitlines()
+        lines.append(f"- {tool.__name__}: {doc_lines[0] if doc_lines else ''}")
+    return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_model_client() -> "OpenAIChatCompletionClient":
+    """返回共享的模型客户端，首次调用时使用环境变量中的API密钥和模型名称创建."""
+    import httpx
+    from autogen_ext.models.openai import OpenAIChatCompletionClient
+    
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise ValueError("请设置OPENAI_API_KEY环境变量")
+    
+    return OpenAIChatCompletionClient(
+        model=os.getenv("OPENAI_MODEL", "gpt-4o"),
+        api_key=api_key,
+        # 所有演示共用一个连接池，后续请求复用已建立的连接
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+        )
+    )
+
+
+def print_available_tools(all_tools: List[Callable], tools_by_category: Dict[str, List[Callable]]):
+    """打印所有可用工具的信息.
     
+    Args:
+        all_tools: get_all_tools_as_functions() 返回的工具函数。
+        tools_by_category: enumerate_tools() 返回的按类别组织的工具函数。
+    """
     print(f"发现 {len(all_tools)} 个注册工具:")
     for tool_func in all_tools:
         print(f"- {tool_func.__name__}: {tool_func.__doc__}")
     
     print("\n按类别组织的工具:")
-    tools_by_category = enumerate_tools()
     for category, tools in tools_by_category.items():
         print(f"\n{category.upper()} ({len(tools)} 个工具):")
         for tool_func in tools:
             print(f"- {tool_func.__name__}")
 
 
-async def demo_with_autogen():
-    """创建一个AutoGen助手，可以使用所有可用工具."""
-    # 获取API密钥和模型名称
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
-        raise ValueError("请设置OPENAI_API_KEY环境变量")
+async def demo_with_autogen(all_tool_functions: List[Callable]):
+    """创建一个AutoGen助手，可以使用所有可用工具.
     
-    model = os.getenv("OPENAI_MODEL", "gpt-4o")
-    
-    # 创建模型客户端
-    model_client = OpenAIChatCompletionClient(
-        model=model,
-        api_key=openai_api_key
-    )
+    Args:
+        all_tool_functions: get_all_tools_as_functions() 返回的工具函数。
+    """
+    from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
+    from autogen_agentchat.messages import TextMessage
+    from autogen_agentchat.ui import Console
+    from autogen_core import CancellationToken
     
-    # 获取所有工具作为函数
-    all_tool_functions = get_all_tools_as_functions()
+    # 获取共享的模型客户端
+    model_client = _get_model_client()
     
     if not all_tool_functions:
         print("警告: 没有发现任何工具。请先创建一些工具。")
@@ -78,14 +134,14 @@ async def demo_with_autogen():
     for tool_func in all_tool_functions:
         print(f"- {tool_func.__name__}")
     
-    # 创建助手代理，使用所有可用工具
+    # 创建助手代理，使用所有可用工具（包装为协程，使同一轮的工具调用并发执行）
     assistant = AssistantAgent(
         name="assistant",
         model_client=model_client,
-        tools=all_tool_functions,
+        tools=as_async_tools(all_tool_functions),
         system_message="""你是一个有用的助手，可以使用多种工具来帮助用户完成任务。
 你有以下工具可用:
-""" + "\n".join([f"- {tool.__name__}: {tool.__doc__}" for tool in all_tool_functions])
+""" + format_tool_list(all_tool_functions)
     )
     
     # 创建用户代理
@@ -111,23 +167,20 @@ async def demo_with_autogen():
     await Console(response_stream, output_stats=True)
 
 
-async def demo_with_category():
-    """创建一个AutoGen助手，只使用特定类别的工具."""
-    # 获取API密钥和模型名称
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    if not openai_api_key:
-        raise ValueError("请设置OPENAI_API_KEY环境变量")
+async def demo_with_category(tools_by_category: Dict[str, List[Callable]], category: Optional[str] = None):
+    """创建一个AutoGen助手，只使用特定类别的工具.
     
-    model = os.getenv("OPENAI_MODEL", "gpt-4o")
+    Args:
+        tools_by_category: enumerate_tools() 返回的按类别组织的工具函数。
+        category: 要使用的类别。为None时优先使用utility_tools，否则使用第一个可用类别。
+    """
+    from autogen_agentchat.agents import AssistantAgent, UserProxyAgent
+    from autogen_agentchat.messages import TextMessage
+    from autogen_agentchat.ui import Console
+    from autogen_core import CancellationToken
     
-    # 创建模型客户端
-    model_client = OpenAIChatCompletionClient(
-        model=model,
-        api_key=openai_api_key
-    )
-    
-    # 按类别获取工具
-    tools_by_category = enumerate_tools()
+    # 获取共享的模型客户端
+    model_client = _get_model_client()
     
     if not tools_by_category:
         print("警告: 没有发现任何工具。请先创建一些工具。")
@@ -137,8 +190,9 @@ async def demo_with_category():
     available_categories = list(tools_by_category.keys())
     print(f"可用工具类别: {', '.join(available_categories)}")
     
-    # 如果有utility_tools类别，使用它；否则使用第一个可用类别
-    category = "utility_tools" if "utility_tools" in available_categories else available_categories[0]
+    # 未指定类别时，如果有utility_tools类别，使用它；否则使用第一个可用类别
+    if category is None:
+        category = "utility_tools" if "utility_tools" in available_categories else available_categories[0]
     category_tools = tools_by_category.get(category, [])
     
     if not category_tools:
@@ -154,10 +208,10 @@ async def demo_with_category():
     assistant = AssistantAgent(
         name="assistant",
         model_client=model_client,
-        tools=category_tools,
+        tools=as_async_tools(category_tools),
         system_message=f"""你是一个有用的助手，专注于{category}领域。
 你有以下工具可用:
-""" + "\n".join([f"- {tool.__name__}: {tool.__doc__}" for tool in category_tools])
+""" + format_tool_list(category_tools)
     )
     
     # 创建用户代理
@@ -183,37 +237,65 @@ async def demo_with_category():
     await Console(response_stream, output_stats=True)
 
 
-async def main():
-    """主函数，用于运行示例."""
+async def main(demo: Optional[str] = None, category: Optional[str] = None):
+    """主函数，用于运行示例.
+    
+    Args:
+        demo: 要运行的演示，"all" 使用所有工具，"category" 使用特定类别的工具；
+            为None时只列出工具。
+        category: "category" 演示使用的类别，为None时自动选择。
+    """
+    # Python 3.12+ 中让同步完成的任务立即执行，不再经过一次事件循环调度
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
+    # 工具列表只获取一次，打印和演示共用
+    all_tools = get_all_tools_as_functions()
+    tools_by_category = enumerate_tools()
+    
     # 首先打印所有可用工具的信息
     print("=" * 50)
     print("查看所有可用工具:")
     print("=" * 50)
-    print_available_tools()
-    
-    # 询问用户想要运行哪个演示
-    print("\n" + "=" * 50)
-    print("请选择要运行的演示:")
-    print("1. 使用所有工具的助手")
-    print("2. 使用特定类别工具的助手")
-    print("3. 退出")
-    
-    choice = input("\n请输入选项 (1-3): ").strip()
-    
-    if choice == "1":
-        print("\n" + "=" * 50)
-        print("启动使用所有工具的助手...")
-        print("=" * 50 + "\n")
-        await demo_with_autogen()
-    elif choice == "2":
-        print("\n" + "=" * 50)
-        print("启动使用特定类别工具的助手...")
-        print("=" * 50 + "\n")
-        await demo_with_category()
-    else:
-        print("退出程序")
+    print_available_tools(all_tools, tools_by_category)
+    
+    try:
+        if demo == "all":
+            print("\n" + "=" * 50)
+            print("启动使用所有工具的助手...")
+            print("=" * 50 + "\n")
+            await demo_with_autogen(all_tools)
+        elif demo == "category":
+            print("\n" + "=" * 50)
+            print("启动使用特定类别工具的助手...")
+            print("=" * 50 + "\n")
+            await demo_with_category(tools_by_category, category)
+        else:
+            print("\n使用 --demo all 运行使用所有工具的助手，--demo category 运行使用特定类别工具的助手")
+    finally:
+        # 关闭共享客户端的连接池（只在创建过客户端时）
+        if _get_model_client.cache_info().currsize:
+            await _get_model_client().close()
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    
+    # 加载.env文件中的环境变量
+    load_dotenv()
+    
+    # 通过命令行参数选择演示，不在事件循环中阻塞等待输入
+    parser = argparse.ArgumentParser(description="枚举并使用所有可用工具的示例")
+    parser.add_argument("--demo", choices=["all", "category"], help="要运行的演示")
+    parser.add_argument("--category", help="--demo category 使用的工具类别，默认自动选择")
+    args = parser.parse_args()
+    
+    # 安装了uvloop时使用它作为事件循环
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     # 使用asyncio运行主函数
-    asyncio.run(main()) 
\ No newline at end of file
+    asyncio.run(main(args.demo, args.category))
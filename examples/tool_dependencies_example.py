@@ -8,12 +8,13 @@ This example shows how to:
 """
 
 import os
+import asyncio
 from autogen_toolsmith.tools import get_tool, list_tools
 from autogen_toolsmith.generator.code_generator import ToolGenerator
 from autogen_ext.models.openai import OpenAIChatCompletionClient
 
 
-def main():
+async def main():
     # Check if the OpenAI API key is set
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
@@ -75,7 +76,7 @@ def main():
     """
     
     # Generate the tool
-    result = generator.create_tool(tool_spec)
+    result = await generator.create_tool(tool_spec)
     
     if result:
         print(f"New tool created at: {result}")
@@ -93,4 +94,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+Tests for the tool generator's response cache and batch creation.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from autogen_toolsmith.generator.code_generator import ToolGenerator
+
+
+class FakeModelClient:
+    """A model client that answers every prompt with a numbered response."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    async def create(self, messages, extra_create_args=None):
+        self.calls += 1
+        return SimpleNamespace(content=f"response {self.calls}")
+    
+    async def create_stream(self, messages, extra_create_args=None):
+        self.calls += 1
+        content = f"response {self.calls}"
+        for chunk in content.split(" "):
+            yield chunk + " "
+        yield SimpleNamespace(content=content)
+
+
+def make_generator(cache_dir, cache_model="model-a"):
+    return ToolGenerator(model_client=FakeModelClient(), cache_dir=str(cache_dir), cache_model=cache_model)
+
+
+def test_miss_calls_model_without_caching(tmp_path):
+    """Test that a new response is not cached until it is stored."""
+    generator = make_generator(tmp_path)
+    
+    assert asyncio.run(generator._generate_code("prompt")) == "response 1"
+    assert asyncio.run(generator._generate_code("prompt")) == "response 2"
+    assert generator.model_client.calls == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_hit_after_store(tmp_path):
+    """Test that a stored response is returned without calling the model."""
+    generator = make_generator(tmp_path)
+    generator._store_cached_response("prompt", "accepted")
+    
+    assert asyncio.run(generator._generate_code("prompt")) == "accepted"
+    assert generator.model_client.calls == 0
+    
+    # Other prompts still miss
+    assert asyncio.run(generator._generate_code("other prompt")) == "response 1"
+
+
+def test_use_cache_false_bypasses_hit(tmp_path):
+    """Test that use_cache=False always samples the model."""
+    generator = make_generator(tmp_path)
+    generator._store_cached_response("prompt", "accepted")
+    
+    assert asyncio.run(generator._generate_code("prompt", use_cache=False)) == "response 1"
+    assert generator.model_client.calls == 1
+
+
+def test_cache_is_keyed_on_model(tmp_path):
+    """Test that responses cached for one model are not returned for another."""
+    make_generator(tmp_path, cache_model="model-a")._store_cached_response("prompt", "from a")
+    
+    other = make_generator(tmp_path, cache_model="model-b")
+    assert asyncio.run(other._generate_code("prompt")) == "response 1"
+    
+    same = make_generator(tmp_path, cache_model="model-a")
+    assert asyncio.run(same._generate_code("prompt")) == "from a"
+    assert same.model_client.calls == 0
+
+
+def test_cache_disabled_without_model(tmp_path):
+    """Test that cache_dir is ignored when cache_model is not given."""
+    generator = make_generator(tmp_path / "cache", cache_model=None)
+    generator._store_cached_response("prompt", "accepted")
+    
+    assert generator.cache_dir is None
+    assert asyncio.run(generator._generate_code("prompt")) == "response 1"
+    assert not (tmp_path / "cache").exists()
+
+
+def test_stream_to_debug_file(tmp_path):
+    """Test that a streamed response is written to the debug file, but a cached one is not."""
+    generator = make_generator(tmp_path / "cache")
+    debug_file = tmp_path / "debug.txt"
+    
+    assert asyncio.run(generator._generate_code("prompt", stream_to=str(debug_file))) == "response 1"
+    assert debug_file.read_text() == "response 1 "
+    
+    generator._store_cached_response("prompt", "response 1")
+    assert asyncio.run(generator._generate_code("prompt", stream_to=str(debug_file))) == "response 1"
+    assert debug_file.read_text() == "response 1 "
+
+
+class FakeCreateTool:
+    """Stands in for create_tool, recording how many calls overlap."""
+    
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+        self.running = 0
+        self.max_running = 0
+        self.calls = []
+    
+    async def __call__(self, specification, output_dir=None, register=True):
+        self.calls.append((specification, output_dir, register))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            # Later specifications finish first, so the result order cannot
+            # come from completion order
+            await asyncio.sleep(0.01 / (len(self.calls) + 1))
+            if specification in self.fail:
+                raise RuntimeError(f"cannot create {specification}")
+            return f"tool_{specification}"
+        finally:
+            self.running -= 1
+
+
+def test_create_tools_batch_order_and_failures(tmp_path):
+    """Test that results follow the specification order, with None for failures."""
+    generator = make_generator(tmp_path)
+    generator.create_tool = FakeCreateTool(fail={"b"})
+    
+    results = asyncio.run(generator.create_tools_batch(
+        ["a", "b", "c"],
+        output_dirs=["dir_a", None, "dir_c"],
+        register=False
+    ))
+    
+    assert results == ["tool_a", None, "tool_c"]
+    assert sorted(generator.create_tool.calls) == [
+        ("a", "dir_a", False), ("b", None, False), ("c", "dir_c", False)
+    ]
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_create_tools_batch_concurrency_bound(tmp_path, max_concurrency):
+    """Test that no more than max_concurrency tools are created at once."""
+    generator = make_generator(tmp_path)
+    generator.create_tool = FakeCreateTool()
+    specifications = [str(i) for i in range(8)]
+    
+    results = asyncio.run(generator.create_tools_batch(specifications, max_concurrency=max_concurrency))
+    
+    assert results == [f"tool_{i}" for i in range(8)]
+    assert generator.create_tool.max_running == max_concurrency
+
+
+def test_create_tools_batch_output_dirs_length(tmp_path):
+    """Test that output_dirs must match the specifications."""
+    generator = make_generator(tmp_path)
+    generator.create_tool = FakeCreateTool()
+    
+    with pytest.raises(ValueError):
+        asyncio.run(generator.create_tools_batch(["a", "b"], output_dirs=["dir_a"]))
+    assert generator.create_tool.calls == []
@@ -0,0 +1,35 @@
+"""
+Tests for the code validator's scratch directory.
+"""
+
+import os
+
+import pytest
+from autogen_toolsmith.generator import code_validator
+from autogen_toolsmith.generator.code_validator import CodeValidator
+
+
+def test_scratch_dir_created_on_first_use(monkeypatch):
+    """Test that the scratch directory is created once, on first access."""
+    created = []
+    registered = []
+    real_mkdtemp = code_validator.tempfile.mkdtemp
+    
+    def mkdtemp(*args, **kwargs):
+        created.append(real_mkdtemp(*args, **kwargs))
+        return created[-1]
+    
+    monkeypatch.setattr(code_validator.tempfile, "mkdtemp", mkdtemp)
+    monkeypatch.setattr(code_validator.atexit, "register", lambda *args, **kwargs: registered.append(args))
+    
+    validators = [CodeValidator() for _ in range(3)]
+    assert created == []
+    assert registered == []
+    
+    validator = validators[0]
+    assert validator.scratch_dir == validator.scratch_dir
+    assert created == [validator.scratch_dir]
+    assert os.path.isdir(validator.scratch_dir)
+    assert len(registered) == 1
+    
+    code_validator.shutil.rmtree(validator.scratch_dir)
@@ -0,0 +1,271 @@
+"""
+Tests for loading tools into the tool registry.
+"""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import autogen_toolsmith
+from autogen_toolsmith.storage.registry import ToolRegistry, _LazyTool
+from autogen_toolsmith.tools.base.tool_base import FunctionTool
+
+
+TOOL_SOURCE = '''
+from autogen_toolsmith.tools.base.tool_base import BaseTool
+
+
+class {class_name}(BaseTool):
+    def __init__(self):
+        super().__init__(
+            name="{name}",
+            description="{description}",
+            version="{version}",
+            category="utility_tools",
+            tags=["test"]
+        )
+
+    def run(self, text: str, {extra_param}):
+        return "{result}:" + text
+'''
+
+
+def write_tool(storage_dir, file_name, name="echo", version="0.1.0", result="echo",
+               class_name="EchoTool", description="Echo text", extra_param="times: int = 1"):
+    """Write a tool module into the utility_tools category of a storage directory."""
+    category_dir = storage_dir / "utility_tools"
+    category_dir.mkdir(parents=True, exist_ok=True)
+    (category_dir / file_name).write_text(TOOL_SOURCE.format(
+        class_name=class_name,
+        name=name,
+        description=description,
+        version=version,
+        extra_param=extra_param,
+        result=result
+    ))
+
+
+def test_fresh_load(tmp_path):
+    """Test that a fresh load imports and registers the tool."""
+    write_tool(tmp_path, "echo.py")
+    
+    registry = ToolRegistry(str(tmp_path))
+    
+    assert registry.get_tool("echo").run("hi") == "echo:hi"
+    assert [tool["name"] for tool in registry.list_tools()] == ["echo"]
+    assert (tmp_path / "tool_manifest.json").exists()
+    assert (tmp_path / "tool_index.json").exists()
+
+
+def test_cached_load(tmp_path):
+    """Test that an unchanged file is restored from the manifest without importing it."""
+    write_tool(tmp_path, "echo.py")
+    fresh = ToolRegistry(str(tmp_path))
+    
+    cached = ToolRegistry(str(tmp_path))
+    
+    # The tool is not imported until it is used
+    assert isinstance(cached.tools["echo"], _LazyTool)
+    assert cached.list_tools() == fresh.list_tools()
+    assert cached.tools["echo"].metadata.version == "0.1.0"
+    assert cached.tools["echo"].to_dict() == fresh.get_tool("echo").to_dict()
+    
+    # Fetching the tool swaps in the real instance
+    tool = cached.get_tool("echo")
+    assert not isinstance(tool, _LazyTool)
+    assert tool.run("hi") == "echo:hi"
+
+
+def test_changed_file_is_reimported(tmp_path):
+    """Test that a file changed since the last load is imported again."""
+    write_tool(tmp_path, "echo.py")
+    ToolRegistry(str(tmp_path))
+    
+    write_tool(tmp_path, "echo.py", version="0.2.0", result="changed")
+    registry = ToolRegistry(str(tmp_path))
+    
+    assert not isinstance(registry.tools["echo"], _LazyTool)
+    assert registry.get_tool("echo").metadata.version == "0.2.0"
+    assert registry.get_tool("echo").run("hi") == "changed:hi"
+
+
+@pytest.mark.parametrize("loads", [1, 2, 3])
+@pytest.mark.parametrize("newer_file, older_file", [("a.py", "b.py"), ("b.py", "a.py")])
+def test_duplicate_tool_name(tmp_path, loads, newer_file, older_file):
+    """Test that the newer of two tools with the same name wins on fresh and cached loads."""
+    # Both file orders are covered, since the directory listing order decides
+    # which file is seen first
+    write_tool(tmp_path, newer_file, name="foo", version="2.0.0", result="A", class_name="FooATool")
+    write_tool(tmp_path, older_file, name="foo", version="1.0.0", result="B", class_name="FooBTool")
+    
+    for _ in range(loads):
+        registry = ToolRegistry(str(tmp_path))
+    
+    assert registry.list_tools()[0]["version"] == "2.0.0"
+    tool = registry.get_tool("foo")
+    assert tool.metadata.version == "2.0.0"
+    assert tool.run("hi") == "A:hi"
+
+
+@pytest.mark.parametrize("loads", [1, 2])
+def test_non_json_default(tmp_path, loads):
+    """Test that a tool whose defaults cannot be written to the manifest still loads."""
+    write_tool(tmp_path, "split.py", name="split", extra_param='seps: frozenset = frozenset({","})')
+    
+    for _ in range(loads):
+        registry = ToolRegistry(str(tmp_path))
+    
+    assert registry.get_tool("split").run("hi") == "echo:hi"
+
+
+def test_invalid_manifest(tmp_path):
+    """Test that an unreadable manifest makes the load import the files again."""
+    write_tool(tmp_path, "echo.py")
+    ToolRegistry(str(tmp_path))
+    (tmp_path / "tool_manifest.json").write_text("not json")
+    
+    registry = ToolRegistry(str(tmp_path))
+    
+    assert not isinstance(registry.tools["echo"], _LazyTool)
+    assert registry.get_tool("echo").run("hi") == "echo:hi"
+
+
+@pytest.mark.parametrize("loads", [1, 2])
+def test_listing_returns_copies(tmp_path, loads):
+    """Test that modifying listed metadata or tool info leaves the registry unchanged."""
+    write_tool(tmp_path, "echo.py")
+    for _ in range(loads):
+        registry = ToolRegistry(str(tmp_path))
+    expected = registry.get_tool_info("echo")
+    
+    metadata = registry.list_tools()[0]
+    metadata["version"] = "9.9.9"
+    metadata["tags"].append("changed")
+    tool_info = registry.get_tool_info("echo")
+    tool_info["metadata"]["name"] = "changed"
+    tool_info["signature"]["parameters"]["text"]["type"] = "changed"
+    
+    assert registry.list_tools("utility_tools")[0] == expected["metadata"]
+    assert registry.get_tool_info("echo") == expected
+    assert registry.tools["echo"].to_dict() == expected
+    assert registry.get_tool_info("missing") is None
+
+
+def make_tool(name):
+    """Make a tool that does not need a module on disk."""
+    return FunctionTool(lambda text: text, name=name, category="utility_tools")
+
+
+def indexed_names(storage_dir):
+    """Read the tool names from the index file, if it has been written."""
+    index_file = storage_dir / "tool_index.json"
+    if not index_file.exists():
+        return []
+    return sorted(json.loads(index_file.read_text()))
+
+
+def test_batch_defers_index_write(tmp_path):
+    """Test that the index is written once, when the batch ends."""
+    write_tool(tmp_path, "echo.py")
+    registry = ToolRegistry(str(tmp_path))
+    
+    with registry.batch():
+        registry.register(make_tool("a"))
+        registry.register(make_tool("b"))
+        registry.remove_tool("echo")
+        assert indexed_names(tmp_path) == ["echo"]
+    
+    assert indexed_names(tmp_path) == ["a", "b"]
+    
+    # Outside a batch every call writes the index again
+    registry.register(make_tool("c"))
+    assert indexed_names(tmp_path) == ["a", "b", "c"]
+
+
+def test_nested_batches_write_on_outermost_exit(tmp_path):
+    """Test that only the outermost batch writes the index."""
+    registry = ToolRegistry(str(tmp_path))
+    
+    with registry.batch():
+        with registry.batch():
+            registry.register(make_tool("a"))
+        assert indexed_names(tmp_path) == []
+        registry.register(make_tool("b"))
+        assert indexed_names(tmp_path) == []
+    
+    assert indexed_names(tmp_path) == ["a", "b"]
+
+
+def test_batch_writes_index_after_exception(tmp_path):
+    """Test that the index is still written when the batch block raises."""
+    registry = ToolRegistry(str(tmp_path))
+    
+    with pytest.raises(RuntimeError):
+        with registry.batch():
+            with registry.batch():
+                registry.register(make_tool("a"))
+                raise RuntimeError("failed")
+    
+    assert indexed_names(tmp_path) == ["a"]
+    
+    # The batch is over, so the next call writes immediately
+    registry.register(make_tool("b"))
+    assert indexed_names(tmp_path) == ["a", "b"]
+
+
+@pytest.mark.parametrize("import_workers", [1, 8])
+def test_serial_and_concurrent_imports_agree(tmp_path, import_workers):
+    """Test that importing changed modules in threads or serially gives the same tools."""
+    for i in range(4):
+        write_tool(tmp_path, f"tool_{i}.py", name=f"tool_{i}", result=str(i), class_name=f"Tool{i}")
+    
+    registry = ToolRegistry(str(tmp_path), import_workers=import_workers)
+    
+    assert len(registry.list_tools()) == 4
+    assert [registry.get_tool(f"tool_{i}").run("x") for i in range(4)] == ["0:x", "1:x", "2:x", "3:x"]
+
+
+def test_import_with_catalog_tool_calling_get_tool(tmp_path):
+    """Test that importing the package does not hang on catalog tools that use get_tool.
+    
+    The global registry loads the catalog while its own module is still being
+    imported, so a tool that imports autogen_toolsmith or calls get_tool in
+    its constructor must not be imported from a worker thread.
+    """
+    # Work on a copy of the package so the real catalog is left untouched
+    package_dir = Path(autogen_toolsmith.__file__).parent
+    shutil.copytree(package_dir, tmp_path / "autogen_toolsmith", ignore=shutil.ignore_patterns(
+        "__pycache__", "tool_index.json", "tool_manifest.json"
+    ))
+    catalog_dir = tmp_path / "autogen_toolsmith" / "tools" / "catalog"
+    (catalog_dir / "utility_tools" / "needs_dep.py").write_text('''
+from autogen_toolsmith.tools import get_tool
+from autogen_toolsmith.tools.base.tool_base import BaseTool
+
+
+class NeedsDepTool(BaseTool):
+    def __init__(self):
+        super().__init__(name="needs_dep", description="Uses a dependency", category="utility_tools")
+        self.dependency = get_tool("echo")
+
+    def run(self):
+        return self.dependency
+''')
+    write_tool(catalog_dir, "echo.py")
+    
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", "import autogen_toolsmith; print('imported')"],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+    except subprocess.TimeoutExpired:
+        pytest.fail("importing autogen_toolsmith hung while loading the catalog")
+    
+    assert result.returncode == 0, result.stderr
+    assert "imported" in result.stdout
@@ -0,0 +1,97 @@
+"""
+Tests for the tool version history.
+"""
+
+import json
+
+import pytest
+from autogen_toolsmith.storage.versioning import ToolVersionManager, _read_lines_backwards
+from autogen_toolsmith.tools.base.tool_base import FunctionTool
+
+
+def make_tool(version):
+    """Create a tool with the given version."""
+    return FunctionTool(lambda text: text, name="echo", version=version, category="utility_tools")
+
+
+def test_history_newest_first(tmp_path):
+    """Test that saved versions are returned newest first."""
+    manager = ToolVersionManager(str(tmp_path))
+    for version in ["0.1.0", "0.2.0", "0.3.0"]:
+        manager.save_version(make_tool(version), "source", commit_message=f"v{version}")
+    
+    history = manager.get_version_history("echo")
+    
+    assert [entry["version"] for entry in history] == ["0.3.0", "0.2.0", "0.1.0"]
+    assert history[0]["commit_message"] == "v0.3.0"
+    assert (tmp_path / "echo" / "history.jsonl").exists()
+
+
+@pytest.mark.parametrize("limit, expected", [
+    (None, ["0.3.0", "0.2.0", "0.1.0"]),
+    (0, []),
+    (1, ["0.3.0"]),
+    (2, ["0.3.0", "0.2.0"]),
+    (10, ["0.3.0", "0.2.0", "0.1.0"]),
+])
+def test_history_limit(tmp_path, limit, expected):
+    """Test that limit keeps only the newest entries."""
+    manager = ToolVersionManager(str(tmp_path))
+    for version in ["0.1.0", "0.2.0", "0.3.0"]:
+        manager.save_version(make_tool(version), "source")
+    
+    history = manager.get_version_history("echo", limit=limit)
+    
+    assert [entry["version"] for entry in history] == expected
+
+
+def test_missing_history(tmp_path):
+    """Test that a tool without saved versions has an empty history."""
+    manager = ToolVersionManager(str(tmp_path))
+    
+    assert manager.get_version_history("missing") == []
+
+
+def test_legacy_history_migration(tmp_path):
+    """Test that a legacy history.json is converted to history.jsonl."""
+    # Legacy format: a JSON array, oldest entry first
+    legacy = [
+        {"version_id": f"0.{i}.0-2024010100000{i}", "version": f"0.{i}.0",
+         "timestamp": f"2024010100000{i}", "commit_message": f"change {i}", "author": "me"}
+        for i in range(1, 4)
+    ]
+    tool_dir = tmp_path / "echo"
+    tool_dir.mkdir()
+    (tool_dir / "history.json").write_text(json.dumps(legacy, indent=2))
+    manager = ToolVersionManager(str(tmp_path))
+    
+    history = manager.get_version_history("echo")
+    
+    assert history == list(reversed(legacy))
+    assert not (tool_dir / "history.json").exists()
+    lines = (tool_dir / "history.jsonl").read_text().splitlines()
+    assert [json.loads(line) for line in lines] == legacy
+    
+    # New versions are appended after the migrated entries
+    manager.save_version(make_tool("0.4.0"), "source")
+    history = manager.get_version_history("echo", limit=2)
+    assert [entry["version"] for entry in history] == ["0.4.0", "0.3.0"]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 8, 64, 8192])
+@pytest.mark.parametrize("content", [
+    b"",
+    b"one\n",
+    b"one",
+    b"one\ntwo\nthree\n",
+    b"a much longer first line\nb\n\nc line\n",
+    b"no trailing newline\nlast",
+])
+def test_read_lines_backwards(tmp_path, block_size, content):
+    """Test reading lines backwards, including blocks smaller than one line."""
+    path = tmp_path / "lines.txt"
+    path.write_bytes(content)
+    
+    lines = list(_read_lines_backwards(path, block_size=block_size))
+    
+    assert lines == list(reversed(content.split(b"\n")))
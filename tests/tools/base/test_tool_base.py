@@ -0,0 +1,103 @@
+"""
+Tests for the tool signature description.
+"""
+
+import functools
+import inspect
+
+import pytest
+from autogen_toolsmith.tools.base.tool_base import _describe_callable
+
+
+def describe_with_inspect(func, skip_self):
+    """Describe a callable through inspect.signature, as the reference result."""
+    empty = inspect.Parameter.empty
+    sig = inspect.signature(func)
+    parameters = {
+        name: {
+            "type": param.annotation.__name__ if param.annotation is not empty else "Any",
+            "description": "",
+            "default": None if param.default is empty else param.default
+        }
+        for name, param in sig.parameters.items()
+        if not (skip_self and name == "self")
+    }
+    returns = sig.return_annotation.__name__ if sig.return_annotation is not empty else "Any"
+    return parameters, returns
+
+
+def plain(text: str, times: int = 2) -> str:
+    return text * times
+
+
+def unannotated(a, b=None, *rest):
+    return a
+
+
+def positional_only(a: int, b: str = "x", /, c: float = 1.0) -> bool:
+    return True
+
+
+def keyword_only(a, *, flag: bool = False, limit: int) -> dict:
+    return {}
+
+
+def var_args(a: int, *args: str, key: str = "k", **kwargs: int) -> list:
+    return []
+
+
+def var_kwargs_only(**options):
+    return options
+
+
+@functools.wraps(plain)
+def wrapped(*args, **kwargs):
+    return plain(*args, **kwargs)
+
+
+class Sample:
+    def method(self, text: str, count: int = 1) -> str:
+        return text
+    
+    def only_var_args(*args):
+        return args
+    
+    @staticmethod
+    def static(value: int, scale: float = 2.0) -> float:
+        return value * scale
+    
+    @classmethod
+    def klass(cls, name: str = "n") -> str:
+        return name
+
+
+CALLABLES = {
+    "plain": plain,
+    "unannotated": unannotated,
+    "positional_only": positional_only,
+    "keyword_only": keyword_only,
+    "var_args": var_args,
+    "var_kwargs_only": var_kwargs_only,
+    "lambda": lambda x, y=3: x,
+    "wrapped": wrapped,
+    "partial": functools.partial(plain, times=4),
+    "unbound_method": Sample.method,
+    "bound_method": Sample().method,
+    "bound_var_args_method": Sample().only_var_args,
+    "static_method": Sample.static,
+    "class_method": Sample.klass,
+}
+
+
+@pytest.mark.parametrize("skip_self", [True, False])
+@pytest.mark.parametrize("name", list(CALLABLES))
+def test_describe_callable_matches_inspect(name, skip_self):
+    """Test that the fast path gives the same description as inspect.signature."""
+    func = CALLABLES[name]
+    
+    parameters, returns = _describe_callable(func, skip_self)
+    expected_parameters, expected_returns = describe_with_inspect(func, skip_self)
+    
+    # Compare items so that parameter order is checked too
+    assert list(parameters.items()) == list(expected_parameters.items())
+    assert returns == expected_returns